@@ -1,12 +1,17 @@
 from flask import Flask
 from werkzeug.middleware.proxy_fix import ProxyFix
-import json
 import os
 from dotenv import load_dotenv
 
 # Load environment variables from .flaskenv
 load_dotenv('.flaskenv')
 
+
+def _env_flag(name, default=True):
+    """Read a boolean environment variable ("true", "1" or "yes" enable it)"""
+    return os.environ.get(name, str(default)).lower() in ("true", "1", "yes")
+
+
 app = Flask(__name__, instance_relative_config=True)
 
 # Apply ProxyFix to handle X-Forwarded headers from Nexus proxy
@@ -38,7 +43,7 @@ app.logger.setLevel(getattr(logging, log_level, logging.INFO))
 
 # Enable structured JSON logging with correlation IDs
 # Set ENABLE_JSON_LOGGING=false in environment to disable for development
-enable_json = os.environ.get("ENABLE_JSON_LOGGING", "true").lower() in ("true", "1", "yes")
+enable_json = _env_flag('ENABLE_JSON_LOGGING')
 if enable_json:
     from app.structured_logger import setup_structured_logging
     setup_structured_logging(app, enable_json=True)
@@ -53,15 +58,14 @@ if not app.config['CORE_SERVICE_URL']:
     print("Service management will still work, but admin dashboard authentication will not.")
 
 # Load database connection from config file
-import configparser
+from app.conf_cache import load_conf
 try:
     os.makedirs(app.instance_path)
 except OSError:
     pass
 
 config_path = os.path.join(app.instance_path, 'helm.conf')
-config = configparser.RawConfigParser()
-config.read(config_path)
+config = load_conf(config_path)
 app.config['HELM_CONFIG'] = config
 
 # Database configuration - PostgreSQL only
@@ -79,44 +83,87 @@ else:
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 # Connection pool configuration for better performance
+# No pool_pre_ping: it costs a SELECT 1 round trip on every checkout. Stale
+# connections are instead bounded by pool_recycle and detected by TCP keepalives.
 app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
     'pool_size': 10,
-    'pool_recycle': 3600,  # Recycle connections after 1 hour
-    'pool_pre_ping': True,  # Test connections before use
+    'pool_recycle': 300,  # Recycle connections after 5 minutes
+    'pool_pre_ping': False,
     'max_overflow': 5,
+    # psycopg2 fast execution helpers: executemany INSERTs are sent as
+    # multi-row VALUES statements, other executemany calls use execute_batch
+    'executemany_mode': 'values_plus_batch',
+    'insertmanyvalues_page_size': 1000,
+    'executemany_batch_page_size': 500,
+    'connect_args': {
+        'keepalives': 1,
+        'keepalives_idle': 30,
+        'keepalives_interval': 10,
+        'keepalives_count': 3,
+    },
 }
 
 # Load services configuration for service management
 # Helm uses helm_services.json (full config with paths, ports, commands)
 # Other services use services.json (URLs only) via symlink
+# Parsed configs are cached in a pickle sidecar keyed on mtime+size
+from app.services_cache import load_services, apply_services_config
+
 try:
-    with open('helm_services.json') as f:
-        services_config = json.load(f)
-        app.config['SERVICES'] = services_config
+    services_config = load_services('helm_services.json')
 except FileNotFoundError:
     # Fallback to services.json for backwards compatibility during migration
     try:
-        with open('services.json') as f:
-            services_config = json.load(f)
-            app.config['SERVICES'] = services_config
-            print("WARNING: helm_services.json not found, using services.json. Run 'python install_manager.py update-config' to generate.")
+        services_config = load_services('services.json')
+        print("WARNING: helm_services.json not found, using services.json. Run 'python install_manager.py update-config' to generate.")
     except FileNotFoundError:
         print("WARNING: No service configuration found. Run 'python install_manager.py update-config' to generate.")
-        app.config['SERVICES'] = {}
+        services_config = {}
+
+# Derived views (pre-serialized /api/services body, structure-of-arrays
+# lookups) are rebuilt whenever the config is loaded or reloaded
+apply_services_config(app.config, services_config)
+
+# Development guard against N+1 query regressions (see app/query_budget.py)
+query_budget = int(os.environ.get('HELM_QUERY_BUDGET', 0))
+if query_budget > 0:
+    from app.query_budget import enable_query_recording, register_query_budget
+    enable_query_recording(app)
+    register_query_budget(app, query_budget)
 
 from extensions import db
 db.init_app(app)
 
 # Configure rate limiting
-from flask_limiter import Limiter
-from app.rate_limit_key import get_user_id_or_ip
-
-limiter = Limiter(
-    app=app,
-    key_func=get_user_id_or_ip,  # Per-user rate limiting
-    default_limits=["10000 per hour", "500 per minute"],
-    storage_uri="memory://"
-)
+# Flask-Limiter is only imported when rate limiting is enabled (the default).
+# Set RATELIMIT_ENABLED=false to skip it, e.g. for local development.
+def _init_limiter(app):
+    """Create the Flask-Limiter instance for the app"""
+    from flask_limiter import Limiter
+    from app.rate_limit_key import get_user_id_or_ip
+
+    # memory:// keeps separate counters per worker process, so multi-worker
+    # deployments (gunicorn -w N) should point this at a shared store such as
+    # redis://localhost:6379 (requires the redis package)
+    return Limiter(
+        app=app,
+        key_func=get_user_id_or_ip,  # Per-user rate limiting
+        default_limits=["10000 per hour", "500 per minute"],
+        storage_uri=os.environ.get('RATELIMIT_STORAGE_URI', 'memory://'),
+        strategy=os.environ.get('RATELIMIT_STRATEGY', 'fixed-window')
+    )
+
+class _DisabledLimiter:
+    """Stand-in used when rate limiting is disabled; decorators are no-ops"""
+
+    def limit(self, *args, **kwargs):
+        return lambda f: f
+
+    def exempt(self, f):
+        return f
+
+rate_limit_enabled = _env_flag('RATELIMIT_ENABLED')
+limiter = _init_limiter(app) if rate_limit_enabled else _DisabledLimiter()
 
 # Apply middleware to handle URL prefix when behind Nexus proxy
 from app.middleware import PrefixMiddleware
@@ -217,7 +264,9 @@ Swagger(app, config=swagger_config, template=swagger_template)
 from app import routes
 from app import api_routes
 
-# Start log file watcher in background thread
+# Background workers. These are started by the server entry points (run.py
+# and gunicorn.conf.py), not at import time, so CLI tools and the log watcher
+# sidecar that import app don't spin up threads they never use.
 import threading
 from pathlib import Path
 
@@ -227,13 +276,25 @@ def start_log_watcher_thread():
     watcher_thread = threading.Thread(target=start_log_watcher, daemon=True)
     watcher_thread.start()
 
-# Only start log watcher if logs directory exists (i.e., not during initial setup)
-logs_dir = Path('logs')
-if logs_dir.exists():
-    start_log_watcher_thread()
-
-# Add custom Jinja2 filters
-from datetime import datetime, timezone
+def start_background_workers():
+    """Start the log watcher, log writer and log counts refresher, as enabled"""
+    # Only start log watcher if logs directory exists (i.e., not during initial setup).
+    # Multi-worker deployments should set HELM_LOG_WATCHER=false and run
+    # `python log_watcher.py` as a single sidecar process instead, otherwise every
+    # worker ingests the same log lines.
+    if _env_flag('HELM_LOG_WATCHER') and Path('logs').exists():
+        start_log_watcher_thread()
+
+    # Write ingested logs from a background queue in coalesced batches (see
+    # app/log_writer.py). Set HELM_LOG_ASYNC_INGEST=false to insert synchronously.
+    if _env_flag('HELM_LOG_ASYNC_INGEST'):
+        from app.log_writer import start_log_writer
+        start_log_writer(app)
+
+    # Keep the dashboard's last-hour log counts view fresh (see app/log_stats.py)
+    if _env_flag('HELM_LOG_STATS_REFRESH'):
+        from app.log_stats import start_log_counts_refresher
+        start_log_counts_refresher(app)
 
 # Context processor to inject version into all templates
 @app.context_processor
@@ -243,67 +304,6 @@ def inject_version():
         'app_service_name': VERSION_SERVICE_NAME
     }
 
-@app.template_filter('format_datetime')
-def format_datetime(timestamp_str):
-    """Convert ISO timestamp to human-readable format"""
-    if not timestamp_str:
-        return '-'
-
-    try:
-        # Parse ISO format timestamp
-        if isinstance(timestamp_str, str):
-            dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        else:
-            dt = timestamp_str
-
-        # Format nicely: "Nov 19, 2025 10:09 PM"
-        return dt.strftime('%b %d, %Y %I:%M %p')
-    except Exception as e:
-        return str(timestamp_str)
-
-@app.template_filter('format_uptime')
-def format_uptime(timestamp_str):
-    """Convert ISO timestamp to human-readable uptime"""
-    if not timestamp_str:
-        return '-'
-
-    try:
-        # Parse ISO format timestamp
-        if isinstance(timestamp_str, str):
-            started_at = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        else:
-            started_at = timestamp_str
-
-        # Calculate uptime using local time for comparison
-        # Database stores UTC, so we compare with UTC now
-        if started_at.tzinfo is None:
-            # Naive datetime from database - assume it's UTC
-            started_at = started_at.replace(tzinfo=timezone.utc)
-
-        now = datetime.now(timezone.utc)
-        delta = now - started_at
-
-        # Format based on duration
-        total_seconds = int(delta.total_seconds())
-
-        if total_seconds < 0:
-            return '-'
-        elif total_seconds < 60:
-            return f"{total_seconds}s"
-        elif total_seconds < 3600:
-            minutes = total_seconds // 60
-            return f"{minutes}m"
-        elif total_seconds < 86400:
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            if minutes > 0:
-                return f"{hours}h {minutes}m"
-            return f"{hours}h"
-        else:
-            days = total_seconds // 86400
-            hours = (total_seconds % 86400) // 3600
-            if hours > 0:
-                return f"{days}d {hours}h"
-            return f"{days}d"
-    except Exception as e:
-        return '-'
+# Add custom Jinja2 filters
+from app.template_filters import register_template_filters
+register_template_filters(app)
@@ -2,13 +2,19 @@
 API routes for service control and log ingestion
 """
 
-from flask import request, jsonify, g
+from flask import request, g, stream_with_context
 from app import app, limiter
-from app.auth import token_required, admin_required
+from app.auth import token_required, admin_required, user_only
 from app.service_manager import ServiceManager
+from app.json_compat import dumps, loads, ojsonify, etagged_json, etagged_json_bytes, json_body, json_bytes
+from app.log_stats import get_recent_log_counts
+from app import log_writer
+from app.error_responses import service_unavailable
 from extensions import db
 from models import LogEntry, ServiceStatus, ServiceMetric
 from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, or_, and_
+import queue
 import re
 import sys
 import os
@@ -16,9 +22,102 @@ import os
 # Valid service name pattern (alphanumeric, hyphens, underscores, 1-50 chars)
 SERVICE_NAME_PATTERN = re.compile(r'^[a-z0-9_-]{1,50}$')
 
+# Modes accepted by the start/restart endpoints
+SERVICE_MODES = frozenset(('development', 'production'))
+
+def to_naive_utc(dt):
+    """
+    Convert a datetime to naive UTC.
+
+    Log and metric timestamps are stored as naive UTC (timestamp without time
+    zone). Binding naive UTC values keeps range filters a plain
+    timestamp-to-timestamp comparison on the indexed column instead of one
+    that depends on the session time zone.
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def parse_utc_param(value):
+    """
+    Parse an ISO 8601 query parameter into a naive UTC datetime.
+
+    Raises:
+        ValueError: If the value is not a valid ISO 8601 datetime
+    """
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return to_naive_utc(datetime.fromisoformat(value))
+
+
+# String columns on log_entries and their maximum lengths
+LOG_STRING_FIELDS = {'trace_id': 36, 'user_id': 100, 'hostname': 255}
+LOG_LEVELS = frozenset(('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'))
+
+
+def build_log_row(service_name, log_data):
+    """
+    Validate one entry of an ingest request and build its log_entries row.
+
+    Queued rows are written together with other clients' rows, so anything
+    the database would reject is caught here rather than failing the batch.
+
+    Raises:
+        ValueError: If the entry has a value log_entries cannot store
+    """
+    if not isinstance(log_data, dict):
+        raise ValueError('log entry must be an object')
+
+    # Unknown levels are stored as INFO
+    level = log_data.get('level', 'INFO')
+    level = level.upper() if isinstance(level, str) else 'INFO'
+    if level not in LOG_LEVELS:
+        level = 'INFO'
+
+    message = log_data.get('message', '')
+    if not isinstance(message, str):
+        raise ValueError('message must be a string')
+
+    row = {
+        'service_name': service_name,
+        'level': level,
+        # Limit message length; PostgreSQL text cannot hold NUL characters
+        'message': message[:10000].replace('\x00', ''),
+        'context': log_data.get('context')
+    }
+
+    for field, max_length in LOG_STRING_FIELDS.items():
+        value = log_data.get(field)
+        if value is not None and (not isinstance(value, str) or len(value) > max_length):
+            raise ValueError(f'{field} must be a string of at most {max_length} characters')
+        row[field] = value
+
+    process_id = log_data.get('process_id')
+    if process_id is not None and (type(process_id) is not int
+                                   or not 0 <= process_id < 2 ** 31):
+        raise ValueError('process_id must be a non-negative 32-bit integer')
+    row['process_id'] = process_id
+
+    # Without a client timestamp, enqueue_logs stamps the arrival time
+    # (synchronous ingest falls back to the column's server default)
+    timestamp = log_data.get('timestamp')
+    if timestamp:
+        if not isinstance(timestamp, str):
+            raise ValueError('timestamp must be an ISO 8601 string')
+        row['timestamp'] = parse_utc_param(timestamp)
+    return row
+
+
+# Pre-encoded bodies for static error responses; these repeat on every
+# request while a dependency such as Keycloak is down
+KEYCLOAK_AUTH_ERROR_BODY = b'{"error":"Failed to authenticate with Keycloak"}'
+INTERNAL_ERROR_BODY = b'{"error":"Internal server error"}'
+
 # Health check library
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from health_check import HealthChecker
+from security_audit import SecurityAuditor
 
 # ============================================================
 # Service Control API
@@ -26,16 +125,11 @@ from health_check import HealthChecker
 
 @app.route('/api/services', methods=['GET'])
 @token_required
+@user_only
 def list_services():
     """List all configured services"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
-    services = ServiceManager.get_all_services()
-    return jsonify({
-        'services': list(services.keys()),
-        'details': services
-    })
+    # Pre-serialized whenever the services config is loaded or reloaded
+    return etagged_json_bytes(app.config['SERVICES_JSON_BYTES'])
 
 
 @app.route('/api/services/status', methods=['GET'])
@@ -44,7 +138,7 @@ def list_services():
 def all_services_status():
     """Get status of all services"""
     statuses = ServiceManager.get_all_service_statuses()
-    return jsonify(statuses)
+    return etagged_json(statuses)
 
 
 @app.route('/api/dashboard/status', methods=['GET'])
@@ -52,31 +146,13 @@ def all_services_status():
 @token_required
 def dashboard_status():
     """Get complete dashboard data (services + log stats)"""
-    from models import LogEntry
-    from datetime import datetime, timedelta
-    from sqlalchemy import func
-
     # Get all service statuses
     statuses = ServiceManager.get_all_service_statuses()
 
-    # Get recent log statistics
-    log_stats = {}
-    for service_name in statuses.keys():
-        # Count logs by level in last hour
-        one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
-
-        counts = (
-            LogEntry.query
-            .filter(LogEntry.service_name == service_name)
-            .filter(LogEntry.timestamp >= one_hour_ago)
-            .with_entities(LogEntry.level, func.count(LogEntry.id))
-            .group_by(LogEntry.level)
-            .all()
-        )
-
-        log_stats[service_name] = {level: count for level, count in counts}
+    # Last-hour log counts, served from the pre-aggregated view
+    log_stats = get_recent_log_counts(statuses.keys())
 
-    return jsonify({
+    return ojsonify({
         'statuses': statuses,
         'log_stats': log_stats
     })
@@ -89,26 +165,26 @@ def service_status(service_name):
     """Get status of a specific service"""
     try:
         status = ServiceManager.get_service_status(service_name)
-        return jsonify(status)
+        return ojsonify(status)
     except ValueError as e:
         app.logger.error(f'Service not found: {str(e)}')
-        return {'error': 'Service not found'}, 404
+        return ojsonify({'error': 'Service not found'}, 404)
 
 
 @app.route('/api/services/<service_name>/start', methods=['POST'])
 @admin_required
 def start_service(service_name):
     """Start a service"""
-    data = request.get_json() or {}
+    data = json_body() or {}
     mode = data.get('mode', 'development')
 
-    if mode not in ['development', 'production']:
-        return {'error': 'Invalid mode. Must be development or production'}, 400
+    if mode not in SERVICE_MODES:
+        return ojsonify({'error': 'Invalid mode. Must be development or production'}, 400)
 
     result = ServiceManager.start_service(service_name, mode)
     status_code = 200 if result['success'] else 400
 
-    return jsonify(result), status_code
+    return ojsonify(result, status_code)
 
 
 @app.route('/api/services/<service_name>/stop', methods=['POST'])
@@ -118,23 +194,23 @@ def stop_service(service_name):
     result = ServiceManager.stop_service(service_name)
     status_code = 200 if result['success'] else 400
 
-    return jsonify(result), status_code
+    return ojsonify(result, status_code)
 
 
 @app.route('/api/services/<service_name>/restart', methods=['POST'])
 @admin_required
 def restart_service(service_name):
     """Restart a service"""
-    data = request.get_json() or {}
+    data = json_body() or {}
     mode = data.get('mode', 'development')
 
-    if mode not in ['development', 'production']:
-        return {'error': 'Invalid mode. Must be development or production'}, 400
+    if mode not in SERVICE_MODES:
+        return ojsonify({'error': 'Invalid mode. Must be development or production'}, 400)
 
     result = ServiceManager.restart_service(service_name, mode)
     status_code = 200 if result['success'] else 400
 
-    return jsonify(result), status_code
+    return ojsonify(result, status_code)
 
 
 # ============================================================
@@ -144,6 +220,10 @@ def restart_service(service_name):
 # Maximum logs per request to prevent abuse
 MAX_LOGS_PER_REQUEST = 10000
 
+# Upper bound on the ingest request body, checked before the JSON is parsed
+# (MAX_LOGS_PER_REQUEST entries with messages capped at 10000 characters)
+MAX_INGEST_BODY_BYTES = 32 * 1024 * 1024
+
 @app.route('/api/logs/ingest', methods=['POST'])
 @limiter.limit("1000 per minute")  # Rate limit log ingestion to prevent abuse
 @token_required
@@ -166,10 +246,14 @@ def ingest_logs():
         ]
     }
     """
-    data = request.get_json()
+    # Reject oversized bodies before parsing them into memory
+    if request.content_length is not None and request.content_length > MAX_INGEST_BODY_BYTES:
+        return ojsonify({'error': 'Request body too large', 'max_bytes': MAX_INGEST_BODY_BYTES}, 413)
+
+    data = json_body()
 
     if not data or 'logs' not in data:
-        return {'error': 'Missing logs array'}, 400
+        return ojsonify({'error': 'Missing logs array'}, 400)
 
     service_name = data.get('service_name')
 
@@ -178,45 +262,54 @@ def ingest_logs():
         service_name = g.service
 
     if not service_name:
-        return {'error': 'service_name is required'}, 400
+        return ojsonify({'error': 'service_name is required'}, 400)
 
     # Validate service_name format to prevent injection/abuse
     if not SERVICE_NAME_PATTERN.match(service_name):
         app.logger.warning(f'Invalid service_name format in log ingestion: {service_name[:100]}')
-        return {'error': 'Invalid service_name format'}, 400
+        return ojsonify({'error': 'Invalid service_name format'}, 400)
 
     logs = data.get('logs', [])
+    if not isinstance(logs, list):
+        return ojsonify({'error': 'logs must be an array'}, 400)
 
     # Enforce maximum batch size
     if len(logs) > MAX_LOGS_PER_REQUEST:
-        return {'error': f'Maximum {MAX_LOGS_PER_REQUEST} logs per request'}, 400
-
-    ingested = 0
+        return ojsonify({
+            'error': f'Maximum {MAX_LOGS_PER_REQUEST} logs per request',
+            'max': MAX_LOGS_PER_REQUEST
+        }, 413)
 
     try:
-        for log_data in logs:
-            # Validate log level
-            level = log_data.get('level', 'INFO').upper()
-            if level not in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'):
-                level = 'INFO'
-
-            log_entry = LogEntry(
-                service_name=service_name,
-                level=level,
-                message=log_data.get('message', '')[:10000],  # Limit message length
-                context=log_data.get('context'),
-                trace_id=log_data.get('trace_id'),
-                user_id=log_data.get('user_id'),
-                hostname=log_data.get('hostname'),
-                process_id=log_data.get('process_id'),
-                timestamp=log_data.get('timestamp') or datetime.utcnow()
-            )
-            db.session.add(log_entry)
-            ingested += 1
-
+        rows = []
+        for index, log_data in enumerate(logs):
+            try:
+                rows.append(build_log_row(service_name, log_data))
+            except ValueError as e:
+                return ojsonify({'error': f'Invalid log entry {index}: {e}'}, 400)
+
+        ingested = len(rows)
+
+        # Hand the batch to the background writer when it is running;
+        # it coalesces requests into large executemany INSERTs
+        if log_writer.is_running():
+            try:
+                log_writer.enqueue_logs(rows)
+            except queue.Full:
+                app.logger.warning('Log ingest queue full, rejecting batch')
+                return service_unavailable(detail='Log ingest queue is full', retry_after=1)
+
+            return ojsonify({
+                'success': True,
+                'ingested': ingested,
+                'message': f'Queued {ingested} log entries'
+            }, 202)
+
+        # Insert the whole batch with executemany instead of per-row ORM adds
+        log_writer.insert_log_rows(rows)
         db.session.commit()
 
-        return jsonify({
+        return ojsonify({
             'success': True,
             'ingested': ingested,
             'message': f'Successfully ingested {ingested} log entries'
@@ -225,11 +318,12 @@ def ingest_logs():
     except Exception as e:
         db.session.rollback()
         app.logger.error(f'Failed to ingest logs: {str(e)}')
-        return {'error': 'Internal server error'}, 500
+        return json_bytes(INTERNAL_ERROR_BODY, 500)
 
 
 @app.route('/api/logs', methods=['GET'])
 @token_required
+@user_only
 def get_logs():
     """
     Retrieve logs with filtering options
@@ -237,15 +331,15 @@ def get_logs():
     Query parameters:
     - service: Filter by service name
     - level: Filter by log level
-    - start_time: ISO format datetime
+    - start_time: ISO format datetime (default: last 24 hours, unless trace_id is given)
     - end_time: ISO format datetime
     - limit: Number of records (default 100, max 1000)
-    - offset: Pagination offset
     - trace_id: Filter by trace ID
+    - context_match: JSON object; only logs whose context contains it
+    - include_total: Set to 1 to also return the total number of matching logs
+    - before_ts, before_id: Keyset cursor; return logs older than this entry.
+      Pass the next_cursor values from the previous page to fetch the next one.
     """
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     # Build query
     query = LogEntry.query
 
@@ -262,53 +356,108 @@ def get_logs():
     if trace_id:
         query = query.filter_by(trace_id=trace_id)
 
+    context_match = request.args.get('context_match')
+    if context_match:
+        try:
+            match = loads(context_match)
+        except ValueError:
+            return ojsonify({'error': 'Invalid context_match format'}, 400)
+        if not isinstance(match, dict):
+            return ojsonify({'error': 'context_match must be a JSON object'}, 400)
+        # JSONB containment (@>), served by the GIN index on context
+        query = query.filter(LogEntry.context.contains(match))
+
     # Time range
+    start_dt = end_dt = None
     start_time = request.args.get('start_time')
     if start_time:
         try:
-            start_dt = datetime.fromisoformat(start_time)
-            query = query.filter(LogEntry.timestamp >= start_dt)
+            start_dt = parse_utc_param(start_time)
         except ValueError:
-            return {'error': 'Invalid start_time format'}, 400
+            return ojsonify({'error': 'Invalid start_time format'}, 400)
+    elif not trace_id:
+        # Bound the scan by default, matching /api/metrics; trace lookups
+        # stay unbounded since a trace may be older than the window
+        start_dt = datetime.utcnow() - timedelta(hours=24)
 
     end_time = request.args.get('end_time')
     if end_time:
         try:
-            end_dt = datetime.fromisoformat(end_time)
-            query = query.filter(LogEntry.timestamp <= end_dt)
+            end_dt = parse_utc_param(end_time)
+        except ValueError:
+            return ojsonify({'error': 'Invalid end_time format'}, 400)
+
+    if start_dt is not None:
+        query = query.filter(LogEntry.timestamp >= start_dt)
+    if end_dt is not None:
+        query = query.filter(LogEntry.timestamp <= end_dt)
+
+    # The exact total costs a second scan of the filtered set, so it is opt-in
+    total = None
+    if request.args.get('include_total', '0') == '1':
+        total = query.with_entities(func.count(LogEntry.id)).scalar()
+
+    # Keyset pagination on (timestamp, id) - constant cost at any depth,
+    # unlike OFFSET
+    before_ts = request.args.get('before_ts')
+    before_id = request.args.get('before_id', type=int)
+    if before_ts and before_id is not None:
+        try:
+            before_dt = parse_utc_param(before_ts)
         except ValueError:
-            return {'error': 'Invalid end_time format'}, 400
+            return ojsonify({'error': 'Invalid before_ts format'}, 400)
+        query = query.filter(or_(
+            LogEntry.timestamp < before_dt,
+            and_(LogEntry.timestamp == before_dt, LogEntry.id < before_id)
+        ))
 
-    # Pagination
-    limit = min(int(request.args.get('limit', 100)), 1000)
-    offset = int(request.args.get('offset', 0))
-
-    # Execute query
-    query = query.order_by(LogEntry.timestamp.desc())
-    total = query.count()
-    logs = query.limit(limit).offset(offset).all()
-
-    return jsonify({
-        'total': total,
-        'limit': limit,
-        'offset': offset,
-        'logs': [log.to_dict() for log in logs]
-    })
+    # Validated here, before the streaming response sends its headers
+    try:
+        limit = max(1, min(int(request.args.get('limit', 100)), 1000))
+    except ValueError:
+        return ojsonify({'error': 'limit must be an integer'}, 400)
+
+    # Fetch one extra row to know whether another page exists
+    query = query.order_by(LogEntry.timestamp.desc(), LogEntry.id.desc())
+    rows = query.limit(limit + 1).yield_per(200)
+
+    def generate():
+        # Serialize row by row so the full page is never held as a list of
+        # dicts plus a second JSON string; the cursor fields follow the logs
+        yield b'{"limit":%d,' % limit
+        if total is not None:
+            yield b'"total":%d,' % total
+        yield b'"logs":['
+        has_more = False
+        last = None
+        for count, log in enumerate(rows):
+            if count == limit:
+                has_more = True
+                break
+            if count:
+                yield b','
+            yield dumps(log.to_dict())
+            last = log
+
+        next_cursor = None
+        if has_more:
+            next_cursor = {'before_ts': last.timestamp.isoformat(), 'before_id': last.id}
+        yield b'],"has_more":' + dumps(has_more) + b',"next_cursor":' + dumps(next_cursor) + b'}'
+
+    return app.response_class(stream_with_context(generate()), mimetype='application/json')
 
 
 @app.route('/api/logs/<int:log_id>', methods=['GET'])
 @token_required
+@user_only
 def get_log(log_id):
     """Get a specific log entry by ID"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
-    log = LogEntry.query.get(log_id)
+    log = db.session.get(LogEntry, log_id)
 
     if not log:
-        return {'error': 'Log entry not found'}, 404
+        return ojsonify({'error': 'Log entry not found'}, 404)
 
-    return jsonify(log.to_dict())
+    return ojsonify(log.to_dict())
 
 
 # ============================================================
@@ -342,23 +491,23 @@ def get_service_metrics(service_name):
         try:
             start_time = datetime.fromisoformat(start_param)
         except ValueError:
-            return {'error': 'Invalid start_time format'}, 400
+            return ojsonify({'error': 'Invalid start_time format'}, 400)
 
     end_param = request.args.get('end_time')
     if end_param:
         try:
             end_time = datetime.fromisoformat(end_param)
         except ValueError:
-            return {'error': 'Invalid end_time format'}, 400
+            return ojsonify({'error': 'Invalid end_time format'}, 400)
 
-    query = query.filter(ServiceMetric.timestamp >= start_time)
-    query = query.filter(ServiceMetric.timestamp <= end_time)
+    query = query.filter(ServiceMetric.timestamp >= to_naive_utc(start_time))
+    query = query.filter(ServiceMetric.timestamp <= to_naive_utc(end_time))
 
     limit = min(int(request.args.get('limit', 100)), 1000)
 
     metrics = query.order_by(ServiceMetric.timestamp.desc()).limit(limit).all()
 
-    return jsonify({
+    return ojsonify({
         'service_name': service_name,
         'start_time': start_time.isoformat(),
         'end_time': end_time.isoformat(),
@@ -371,108 +520,289 @@ def get_service_metrics(service_name):
 # ============================================================
 
 import requests as http_requests
-
-def get_keycloak_admin_token():
-    """Get admin token for Keycloak API calls"""
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
-
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
+import time
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+# Keycloak settings resolved once at import; handlers build URLs from these
+# instead of repeating app.config lookups on every request
+_keycloak_server_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
+_keycloak_realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
+KEYCLOAK = SimpleNamespace(
+    realm=_keycloak_realm,
     # Use admin credentials from config or environment
-    admin_user = app.config.get('KEYCLOAK_ADMIN_USER', 'admin')
-    admin_pass = app.config.get('KEYCLOAK_ADMIN_PASS', 'admin')
+    admin_user=app.config.get('KEYCLOAK_ADMIN_USER', 'admin'),
+    admin_pass=app.config.get('KEYCLOAK_ADMIN_PASS', 'admin'),
+    token_url=f"{_keycloak_server_url}/realms/master/protocol/openid-connect/token",
+    admin_url=f"{_keycloak_server_url}/admin/realms/{_keycloak_realm}",
+)
+
+# Every Keycloak call goes to the same host, so reuse pooled sessions (one per
+# thread, keeping TCP/TLS connections alive) and cache the admin token until it expires
+_keycloak_local = threading.local()
+_keycloak_token_cache = {'access_token': None, 'expires_at': 0.0, 'headers': None}
+_keycloak_token_lock = threading.Lock()
+
+# Refresh the admin token this many seconds before Keycloak expires it
+KEYCLOAK_TOKEN_EXPIRY_SKEW = 30
+
+# User and group lists change rarely but are re-fetched on every admin page
+# refresh, so keep the raw Keycloak JSON for a short time. Entries are
+# dropped whenever Helm itself changes users.
+KEYCLOAK_LIST_CACHE_TTL = 20
+KEYCLOAK_LIST_CACHE_MAX = 64
+_keycloak_list_cache = {}  # (realm, endpoint, params) -> (expires_at, body)
+
+# Paging/search query parameters forwarded to Keycloak's list endpoints
+KEYCLOAK_LIST_PARAMS = ('search', 'first', 'max', 'briefRepresentation')
+_keycloak_list_lock = threading.Lock()
+
+# Shared pool for independent Keycloak calls that can run concurrently
+_keycloak_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='keycloak')
+
+def _keycloak_session():
+    """Return this thread's requests.Session for Keycloak calls"""
+    session = getattr(_keycloak_local, 'session', None)
+    if session is None:
+        session = _keycloak_local.session = http_requests.Session()
+        # Retry transient gateway errors; urllib3 only retries idempotent
+        # methods by default, so user creation (POST) is never replayed
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    return session
 
-    token_url = f"{keycloak_url}/realms/master/protocol/openid-connect/token"
+def _keycloak_api(method, path, token, **kwargs):
+    """
+    Call the Keycloak admin REST API for the configured realm.
 
-    response = http_requests.post(token_url, data={
-        'client_id': 'admin-cli',
-        'username': admin_user,
-        'password': admin_pass,
-        'grant_type': 'password'
-    }, timeout=10)
+    Args:
+        method: HTTP method
+        path: Path below /admin/realms/<realm>, e.g. '/users'
+        token: Admin access token from get_keycloak_admin_token()
+        **kwargs: Passed to requests (e.g. json=...)
 
-    if response.status_code == 200:
-        return response.json().get('access_token')
+    Returns:
+        requests.Response
+    """
+    url = KEYCLOAK.admin_url + path
+    response = _keycloak_session().request(
+        method, url, headers=_keycloak_auth_headers(token), timeout=10, **kwargs
+    )
+    if response.status_code == 401:
+        # The cached token was revoked early (e.g. Keycloak restarted); get a new one once
+        _invalidate_keycloak_admin_token(token)
+        token = get_keycloak_admin_token()
+        if token:
+            response = _keycloak_session().request(
+                method, url, headers=_keycloak_auth_headers(token), timeout=10, **kwargs
+            )
+    return response
+
+def _keycloak_auth_headers(token):
+    """Return the Authorization header dict for token, built once per token"""
+    cached = _keycloak_token_cache['headers']
+    if cached is not None and cached[0] == token:
+        return cached[1]
+    headers = {'Authorization': 'Bearer ' + token}
+    # requests copies headers when preparing a request, so sharing the dict is safe
+    _keycloak_token_cache['headers'] = (token, headers)
+    return headers
+
+def _keycloak_cache_get(key):
+    """Return a cached Keycloak list response body, or None if missing/expired"""
+    with _keycloak_list_lock:
+        entry = _keycloak_list_cache.get(key)
+    if entry and time.monotonic() < entry[0]:
+        return entry[1]
     return None
 
+def _keycloak_cache_set(key, body):
+    """Cache a Keycloak list response body for KEYCLOAK_LIST_CACHE_TTL seconds"""
+    now = time.monotonic()
+    with _keycloak_list_lock:
+        if len(_keycloak_list_cache) >= KEYCLOAK_LIST_CACHE_MAX:
+            # Drop expired entries; if every entry is live, start over
+            for stale in [k for k, (expires_at, _) in _keycloak_list_cache.items() if expires_at <= now]:
+                del _keycloak_list_cache[stale]
+            if len(_keycloak_list_cache) >= KEYCLOAK_LIST_CACHE_MAX:
+                _keycloak_list_cache.clear()
+        _keycloak_list_cache[key] = (now + KEYCLOAK_LIST_CACHE_TTL, body)
+
+def _keycloak_list_params():
+    """Return the forwarded list query parameters as a hashable, ordered tuple"""
+    return tuple((name, request.args[name]) for name in KEYCLOAK_LIST_PARAMS if name in request.args)
+
+def _keycloak_cache_clear():
+    """Drop all cached Keycloak list responses after a mutation"""
+    with _keycloak_list_lock:
+        _keycloak_list_cache.clear()
+
+def get_keycloak_admin_token():
+    """Get admin token for Keycloak API calls, cached until shortly before expiry"""
+    with _keycloak_token_lock:
+        if time.monotonic() < _keycloak_token_cache['expires_at']:
+            return _keycloak_token_cache['access_token']
+
+        response = _keycloak_session().post(KEYCLOAK.token_url, data={
+            'client_id': 'admin-cli',
+            'username': KEYCLOAK.admin_user,
+            'password': KEYCLOAK.admin_pass,
+            'grant_type': 'password'
+        }, timeout=10)
+
+        if response.status_code != 200:
+            return None
+
+        token_data = response.json()
+        access_token = token_data.get('access_token')
+        expires_in = token_data.get('expires_in', 60)
+        _keycloak_token_cache['access_token'] = access_token
+        _keycloak_token_cache['expires_at'] = time.monotonic() + max(expires_in - KEYCLOAK_TOKEN_EXPIRY_SKEW, 0)
+        return access_token
+
+def _keycloak_user_payload(data):
+    """Build the Keycloak user representation from a create-user request body"""
+    return {
+        'username': data['username'],
+        'email': data['email'],
+        'firstName': data.get('firstName', ''),
+        'lastName': data.get('lastName', ''),
+        'enabled': data.get('enabled', True),
+        'emailVerified': data.get('emailVerified', False)
+    }
+
+def _invalidate_keycloak_admin_token(token):
+    """Forget the cached admin token if it is still the one Keycloak rejected"""
+    with _keycloak_token_lock:
+        if _keycloak_token_cache['access_token'] == token:
+            _keycloak_token_cache['access_token'] = None
+            _keycloak_token_cache['expires_at'] = 0.0
+
 
 @app.route('/api/keycloak/users', methods=['GET'])
 @admin_required
 def list_keycloak_users():
-    """List all users in Keycloak"""
+    """List users in Keycloak (supports search, first, max and briefRepresentation)"""
+    params = _keycloak_list_params()
+    cache_key = (KEYCLOAK.realm, 'users', params)
+    body = _keycloak_cache_get(cache_key)
+    if body is not None:
+        return etagged_json_bytes(body)
+
     token = get_keycloak_admin_token()
     if not token:
-        return {'error': 'Failed to authenticate with Keycloak'}, 500
-
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
 
-    users_url = f"{keycloak_url}/admin/realms/{realm}/users"
-    headers = {'Authorization': f'Bearer {token}'}
-
-    response = http_requests.get(users_url, headers=headers, timeout=10)
+    response = _keycloak_api('GET', '/users', token, params=params)
 
     if response.status_code == 200:
-        return jsonify({'users': response.json()})
-    return {'error': 'Failed to fetch users'}, response.status_code
+        # Wrap Keycloak's JSON array as-is instead of decoding and re-encoding it
+        body = b'{"users":' + response.content + b'}'
+        _keycloak_cache_set(cache_key, body)
+        return etagged_json_bytes(body)
+    return ojsonify({'error': 'Failed to fetch users'}, response.status_code)
 
 
 @app.route('/api/keycloak/users', methods=['POST'])
 @admin_required
 def create_keycloak_user():
     """Create a new user in Keycloak"""
+    data = json_body()
+    if not data or not data.get('username') or not data.get('email'):
+        return ojsonify({'error': 'username and email are required'}, 400)
+
     token = get_keycloak_admin_token()
     if not token:
-        return {'error': 'Failed to authenticate with Keycloak'}, 500
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
 
-    data = request.get_json()
-    if not data or not data.get('username') or not data.get('email'):
-        return {'error': 'username and email are required'}, 400
+    response = _keycloak_api('POST', '/users', token, json=_keycloak_user_payload(data))
 
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
+    if response.status_code == 201:
+        _keycloak_cache_clear()
+        return ojsonify({'success': True, 'message': 'User created successfully'}, 201)
+    return ojsonify({'error': 'Failed to create user', 'details': response.text}, response.status_code)
 
-    users_url = f"{keycloak_url}/admin/realms/{realm}/users"
-    headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
 
-    user_data = {
-        'username': data['username'],
-        'email': data['email'],
-        'firstName': data.get('firstName', ''),
-        'lastName': data.get('lastName', ''),
-        'enabled': data.get('enabled', True),
-        'emailVerified': data.get('emailVerified', False)
-    }
+# Upper bound on users accepted by one batch create request
+MAX_KEYCLOAK_BATCH_USERS = 200
 
-    response = http_requests.post(users_url, json=user_data, headers=headers, timeout=10)
+@app.route('/api/keycloak/users/batch', methods=['POST'])
+@admin_required
+def create_keycloak_users_batch():
+    """
+    Create several users in Keycloak concurrently.
+    Expects JSON body: {"users": [{"username": ..., "email": ...}, ...]}
 
-    if response.status_code == 201:
-        return {'success': True, 'message': 'User created successfully'}, 201
-    return {'error': 'Failed to create user', 'details': response.text}, response.status_code
+    Keycloak has no bulk endpoint, so the creates are fanned out over the
+    shared Keycloak pool. Returns 201 if every user was created, otherwise
+    207 with a per-user result list.
+    """
+    data = json_body()
+    users = data.get('users') if data else None
+    if not isinstance(users, list) or not users:
+        return ojsonify({'error': 'users must be a non-empty list'}, 400)
+    if len(users) > MAX_KEYCLOAK_BATCH_USERS:
+        return ojsonify({'error': 'Too many users in one request', 'max': MAX_KEYCLOAK_BATCH_USERS}, 413)
+    if not all(isinstance(u, dict) and u.get('username') and u.get('email') for u in users):
+        return ojsonify({'error': 'username and email are required for every user'}, 400)
+
+    token = get_keycloak_admin_token()
+    if not token:
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
+
+    futures = [
+        (u['username'], _keycloak_executor.submit(_keycloak_api, 'POST', '/users', token,
+                                                  json=_keycloak_user_payload(u)))
+        for u in users
+    ]
+
+    results = []
+    for username, future in futures:
+        try:
+            response = future.result()
+            result = {'username': username, 'status': response.status_code}
+            if response.status_code != 201:
+                result['error'] = response.text
+        except http_requests.RequestException as e:
+            result = {'username': username, 'status': 502, 'error': str(e)}
+        results.append(result)
+
+    created = sum(1 for r in results if r['status'] == 201)
+    if created:
+        _keycloak_cache_clear()
+    return ojsonify({
+        'success': created == len(results),
+        'created': created,
+        'results': results
+    }, 201 if created == len(results) else 207)
 
 
 @app.route('/api/keycloak/users/<user_id>', methods=['PUT'])
 @admin_required
 def update_keycloak_user(user_id):
     """Update a user in Keycloak"""
-    token = get_keycloak_admin_token()
-    if not token:
-        return {'error': 'Failed to authenticate with Keycloak'}, 500
-
-    data = request.get_json()
+    data = json_body()
     if not data:
-        return {'error': 'No data provided'}, 400
+        return ojsonify({'error': 'No data provided'}, 400)
 
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
-
-    user_url = f"{keycloak_url}/admin/realms/{realm}/users/{user_id}"
-    headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
+    token = get_keycloak_admin_token()
+    if not token:
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
 
-    response = http_requests.put(user_url, json=data, headers=headers, timeout=10)
+    response = _keycloak_api('PUT', f'/users/{user_id}', token, json=data)
 
     if response.status_code == 204:
-        return {'success': True, 'message': 'User updated successfully'}
-    return {'error': 'Failed to update user'}, response.status_code
+        _keycloak_cache_clear()
+        return ojsonify({'success': True, 'message': 'User updated successfully'})
+    return ojsonify({'error': 'Failed to update user'}, response.status_code)
 
 
 @app.route('/api/keycloak/users/<user_id>', methods=['DELETE'])
@@ -481,51 +811,40 @@ def delete_keycloak_user(user_id):
     """Delete a user from Keycloak"""
     token = get_keycloak_admin_token()
     if not token:
-        return {'error': 'Failed to authenticate with Keycloak'}, 500
-
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
 
     # First, get the user to check if it's the admin user
-    user_url = f"{keycloak_url}/admin/realms/{realm}/users/{user_id}"
-    headers = {'Authorization': f'Bearer {token}'}
-
-    user_response = http_requests.get(user_url, headers=headers, timeout=10)
+    user_response = _keycloak_api('GET', f'/users/{user_id}', token)
     if user_response.status_code == 200:
         user_data = user_response.json()
         username = user_data.get('username', '').lower()
 
         # Prevent deletion of admin user
         if username == 'admin':
-            return {'error': 'Cannot delete the admin user'}, 403
+            return ojsonify({'error': 'Cannot delete the admin user'}, 403)
 
-    response = http_requests.delete(user_url, headers=headers, timeout=10)
+    response = _keycloak_api('DELETE', f'/users/{user_id}', token)
 
     if response.status_code == 204:
-        return {'success': True, 'message': 'User deleted successfully'}
-    return {'error': 'Failed to delete user'}, response.status_code
+        _keycloak_cache_clear()
+        return ojsonify({'success': True, 'message': 'User deleted successfully'})
+    return ojsonify({'error': 'Failed to delete user'}, response.status_code)
 
 
 @app.route('/api/keycloak/users/<user_id>/reset-password', methods=['POST'])
 @admin_required
 def reset_user_password(user_id):
     """Reset a user's password"""
-    token = get_keycloak_admin_token()
-    if not token:
-        return {'error': 'Failed to authenticate with Keycloak'}, 500
-
-    data = request.get_json()
+    data = json_body() or {}
     password = data.get('password')
     temporary = data.get('temporary', True)
 
     if not password:
-        return {'error': 'password is required'}, 400
+        return ojsonify({'error': 'password is required'}, 400)
 
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
-
-    password_url = f"{keycloak_url}/admin/realms/{realm}/users/{user_id}/reset-password"
-    headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
+    token = get_keycloak_admin_token()
+    if not token:
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
 
     password_data = {
         'type': 'password',
@@ -533,32 +852,35 @@ def reset_user_password(user_id):
         'temporary': temporary
     }
 
-    response = http_requests.put(password_url, json=password_data, headers=headers, timeout=10)
+    response = _keycloak_api('PUT', f'/users/{user_id}/reset-password', token, json=password_data)
 
     if response.status_code == 204:
-        return {'success': True, 'message': 'Password reset successfully'}
-    return {'error': 'Failed to reset password'}, response.status_code
+        return ojsonify({'success': True, 'message': 'Password reset successfully'})
+    return ojsonify({'error': 'Failed to reset password'}, response.status_code)
 
 
 @app.route('/api/keycloak/groups', methods=['GET'])
 @admin_required
 def list_keycloak_groups():
-    """List all groups in Keycloak"""
+    """List groups in Keycloak (supports search, first, max and briefRepresentation)"""
+    params = _keycloak_list_params()
+    cache_key = (KEYCLOAK.realm, 'groups', params)
+    body = _keycloak_cache_get(cache_key)
+    if body is not None:
+        return etagged_json_bytes(body)
+
     token = get_keycloak_admin_token()
     if not token:
-        return {'error': 'Failed to authenticate with Keycloak'}, 500
-
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
 
-    groups_url = f"{keycloak_url}/admin/realms/{realm}/groups"
-    headers = {'Authorization': f'Bearer {token}'}
-
-    response = http_requests.get(groups_url, headers=headers, timeout=10)
+    response = _keycloak_api('GET', '/groups', token, params=params)
 
     if response.status_code == 200:
-        return jsonify({'groups': response.json()})
-    return {'error': 'Failed to fetch groups'}, response.status_code
+        # Wrap Keycloak's JSON array as-is instead of decoding and re-encoding it
+        body = b'{"groups":' + response.content + b'}'
+        _keycloak_cache_set(cache_key, body)
+        return etagged_json_bytes(body)
+    return ojsonify({'error': 'Failed to fetch groups'}, response.status_code)
 
 
 @app.route('/api/keycloak/users/<user_id>/groups', methods=['GET'])
@@ -567,19 +889,16 @@ def get_user_groups(user_id):
     """Get groups for a user"""
     token = get_keycloak_admin_token()
     if not token:
-        return {'error': 'Failed to authenticate with Keycloak'}, 500
-
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
 
-    groups_url = f"{keycloak_url}/admin/realms/{realm}/users/{user_id}/groups"
-    headers = {'Authorization': f'Bearer {token}'}
-
-    response = http_requests.get(groups_url, headers=headers, timeout=10)
+    response = _keycloak_api('GET', f'/users/{user_id}/groups', token)
 
     if response.status_code == 200:
-        return jsonify({'groups': response.json()})
-    return {'error': 'Failed to fetch user groups'}, response.status_code
+        # Wrap Keycloak's JSON array as-is instead of decoding and re-encoding it
+        return app.response_class(
+            b'{"groups":' + response.content + b'}', mimetype='application/json'
+        )
+    return ojsonify({'error': 'Failed to fetch user groups'}, response.status_code)
 
 
 @app.route('/api/keycloak/users/<user_id>/groups', methods=['PUT'])
@@ -589,35 +908,29 @@ def update_user_groups(user_id):
     Update user's group membership (replaces all groups).
     Expects JSON body: {"groups": ["admins", "technicians", ...]}
     """
+    data = json_body()
+    if not data or 'groups' not in data:
+        return ojsonify({'error': 'Missing "groups" in request body'}, 400)
+
     token = get_keycloak_admin_token()
     if not token:
-        return {'error': 'Failed to authenticate with Keycloak'}, 500
-
-    data = request.get_json()
-    if not data or 'groups' not in data:
-        return {'error': 'Missing "groups" in request body'}, 400
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
 
     desired_groups = set(data['groups'])
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
-    headers = {'Authorization': f'Bearer {token}'}
 
-    # Get current groups
-    groups_url = f"{keycloak_url}/admin/realms/{realm}/users/{user_id}/groups"
-    current_response = http_requests.get(groups_url, headers=headers, timeout=10)
+    # Fetch current and available groups concurrently
+    current_future = _keycloak_executor.submit(_keycloak_api, 'GET', f'/users/{user_id}/groups', token)
+    all_groups_future = _keycloak_executor.submit(_keycloak_api, 'GET', '/groups', token)
+    current_response = current_future.result()
+    all_groups_response = all_groups_future.result()
 
     if current_response.status_code != 200:
-        return {'error': 'Failed to fetch current user groups'}, current_response.status_code
-
-    current_groups = {g['name']: g['id'] for g in current_response.json()}
-
-    # Get all available groups (to find IDs for desired groups)
-    all_groups_url = f"{keycloak_url}/admin/realms/{realm}/groups"
-    all_groups_response = http_requests.get(all_groups_url, headers=headers, timeout=10)
+        return ojsonify({'error': 'Failed to fetch current user groups'}, current_response.status_code)
 
     if all_groups_response.status_code != 200:
-        return {'error': 'Failed to fetch available groups'}, all_groups_response.status_code
+        return ojsonify({'error': 'Failed to fetch available groups'}, all_groups_response.status_code)
 
+    current_groups = {g['name']: g['id'] for g in current_response.json()}
     available_groups = {g['name']: g['id'] for g in all_groups_response.json()}
 
     # Determine which groups to add and remove
@@ -626,43 +939,44 @@ def update_user_groups(user_id):
 
     errors = []
 
-    # Remove user from unwanted groups
+    # Membership changes are independent, so issue them all at once:
+    tasks = []  # (method, path, error message on failure)
     for group_name in groups_to_remove:
-        if group_name in current_groups:
-            group_id = current_groups[group_name]
-            remove_url = f"{keycloak_url}/admin/realms/{realm}/users/{user_id}/groups/{group_id}"
-            remove_response = http_requests.delete(remove_url, headers=headers, timeout=10)
-
-            if remove_response.status_code != 204:
-                errors.append(f'Failed to remove from group {group_name}')
+        group_id = current_groups[group_name]
+        tasks.append(('DELETE', f'/users/{user_id}/groups/{group_id}',
+                      f'Failed to remove from group {group_name}'))
 
-    # Add user to new groups
     for group_name in groups_to_add:
         if group_name in available_groups:
             group_id = available_groups[group_name]
-            add_url = f"{keycloak_url}/admin/realms/{realm}/users/{user_id}/groups/{group_id}"
-            add_response = http_requests.put(add_url, headers=headers, timeout=10)
-
-            if add_response.status_code != 204:
-                errors.append(f'Failed to add to group {group_name}')
+            tasks.append(('PUT', f'/users/{user_id}/groups/{group_id}',
+                          f'Failed to add to group {group_name}'))
         else:
             errors.append(f'Group {group_name} does not exist')
 
+    futures = [
+        (_keycloak_executor.submit(_keycloak_api, method, path, token), error)
+        for method, path, error in tasks
+    ]
+    for future, error in futures:
+        if future.result().status_code != 204:
+            errors.append(error)
+
     if errors:
-        return {
+        return ojsonify({
             'success': False,
             'message': 'Partial success with errors',
             'errors': errors,
             'added': list(groups_to_add),
             'removed': list(groups_to_remove)
-        }, 207  # 207 Multi-Status
+        }, 207)  # 207 Multi-Status
 
-    return {
+    return ojsonify({
         'success': True,
         'message': 'Groups updated successfully',
         'added': list(groups_to_add),
         'removed': list(groups_to_remove)
-    }
+    })
 
 
 @app.route('/api/keycloak/users/<user_id>/groups/<group_id>', methods=['PUT'])
@@ -671,19 +985,13 @@ def add_user_to_group(user_id, group_id):
     """Add user to a group"""
     token = get_keycloak_admin_token()
     if not token:
-        return {'error': 'Failed to authenticate with Keycloak'}, 500
-
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
 
-    group_url = f"{keycloak_url}/admin/realms/{realm}/users/{user_id}/groups/{group_id}"
-    headers = {'Authorization': f'Bearer {token}'}
-
-    response = http_requests.put(group_url, headers=headers, timeout=10)
+    response = _keycloak_api('PUT', f'/users/{user_id}/groups/{group_id}', token)
 
     if response.status_code == 204:
-        return {'success': True, 'message': 'User added to group'}
-    return {'error': 'Failed to add user to group'}, response.status_code
+        return ojsonify({'success': True, 'message': 'User added to group'})
+    return ojsonify({'error': 'Failed to add user to group'}, response.status_code)
 
 
 @app.route('/api/keycloak/users/<user_id>/groups/<group_id>', methods=['DELETE'])
@@ -692,63 +1000,84 @@ def remove_user_from_group(user_id, group_id):
     """Remove user from a group"""
     token = get_keycloak_admin_token()
     if not token:
-        return {'error': 'Failed to authenticate with Keycloak'}, 500
-
-    keycloak_url = app.config.get('KEYCLOAK_SERVER_URL', 'http://localhost:8080')
-    realm = app.config.get('KEYCLOAK_REALM', 'hivematrix')
+        return json_bytes(KEYCLOAK_AUTH_ERROR_BODY, 500)
 
-    group_url = f"{keycloak_url}/admin/realms/{realm}/users/{user_id}/groups/{group_id}"
-    headers = {'Authorization': f'Bearer {token}'}
-
-    response = http_requests.delete(group_url, headers=headers, timeout=10)
+    response = _keycloak_api('DELETE', f'/users/{user_id}/groups/{group_id}', token)
 
     if response.status_code == 204:
-        return {'success': True, 'message': 'User removed from group'}
-    return {'error': 'Failed to remove user from group'}, response.status_code
+        return ojsonify({'success': True, 'message': 'User removed from group'})
+    return ojsonify({'error': 'Failed to remove user from group'}, response.status_code)
 
 
 # ============================================================
 # Security Audit API
 # ============================================================
 
+# Audits shell out to ss/ufw/iptables, so results are cached briefly and
+# computed on a single background worker rather than in every request
+SECURITY_AUDIT_CACHE_SECONDS = 60
+SECURITY_AUDIT_WAIT_SECONDS = 15
+
+_audit_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='security-audit')
+_audit_lock = threading.Lock()
+_last_audit = {'findings': None, 'fresh_at': None, 'checked_at': 0.0, 'future': None}
+
+
+def _run_security_audit():
+    """Run the audit and store the findings in _last_audit"""
+    findings = SecurityAuditor().audit_services()
+    with _audit_lock:
+        _last_audit['findings'] = findings
+        _last_audit['fresh_at'] = datetime.utcnow().isoformat() + 'Z'
+        _last_audit['checked_at'] = time.monotonic()
+    return findings
+
+
 @app.route('/api/security/audit', methods=['GET'])
 @token_required
+@user_only
 def security_audit():
-    """Run security audit on all services"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
+    """
+    Run security audit on all services
 
-    import sys
-    import os
+    Findings are cached for SECURITY_AUDIT_CACHE_SECONDS; pass refresh=1 to
+    force a new audit. If an audit takes longer than SECURITY_AUDIT_WAIT_SECONDS
+    the previous findings (if any) are returned with 202 Accepted.
+    """
+    refresh = request.args.get('refresh') == '1'
 
-    # Add security_audit module to path
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    with _audit_lock:
+        age = time.monotonic() - _last_audit['checked_at']
+        if _last_audit['findings'] is not None and age < SECURITY_AUDIT_CACHE_SECONDS and not refresh:
+            return ojsonify(dict(_last_audit['findings'], fresh_at=_last_audit['fresh_at']))
 
-    try:
-        from security_audit import SecurityAuditor
+        # Join an audit already in flight instead of starting another
+        future = _last_audit['future']
+        if future is None or future.done():
+            future = _last_audit['future'] = _audit_executor.submit(_run_security_audit)
 
-        auditor = SecurityAuditor()
-        findings = auditor.audit_services()
-
-        return jsonify(findings)
+    try:
+        findings = future.result(timeout=SECURITY_AUDIT_WAIT_SECONDS)
+    except FutureTimeoutError:
+        with _audit_lock:
+            stale, fresh_at = _last_audit['findings'], _last_audit['fresh_at']
+        if stale is not None:
+            return ojsonify(dict(stale, fresh_at=fresh_at, stale=True), 202)
+        return ojsonify({'status': 'running', 'message': 'Security audit in progress'}, 202)
     except Exception as e:
         app.logger.error(f'Security audit failed: {str(e)}')
-        return {'error': 'Internal server error'}, 500
+        return json_bytes(INTERNAL_ERROR_BODY, 500)
+
+    with _audit_lock:
+        fresh_at = _last_audit['fresh_at']
+    return ojsonify(dict(findings, fresh_at=fresh_at))
 
 
 @app.route('/api/security/firewall-script', methods=['GET'])
 @admin_required
 def generate_firewall_script():
     """Generate firewall configuration script"""
-    import sys
-    import os
-
-    # Add security_audit module to path
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
     try:
-        from security_audit import SecurityAuditor
-
         auditor = SecurityAuditor()
 
         # Get script type from query param
@@ -761,7 +1090,7 @@ def generate_firewall_script():
             script = auditor.generate_firewall_rules()
             filename = 'secure_firewall.sh'
 
-        return jsonify({
+        return ojsonify({
             'success': True,
             'script': script,
             'filename': filename,
@@ -769,13 +1098,26 @@ def generate_firewall_script():
         })
     except Exception as e:
         app.logger.error(f'Failed to generate firewall script: {str(e)}')
-        return {'error': 'Internal server error'}, 500
+        return json_bytes(INTERNAL_ERROR_BODY, 500)
 
 
 # ============================================================
 # Health Check
 # ============================================================
 
+HEALTH_CACHE_SECONDS = 2
+
+_health_checker = HealthChecker(
+    service_name='helm',
+    db=db,
+    dependencies=[
+        ('core', 'http://localhost:5000')
+    ]
+)
+# Probes that arrive while a check is running wait for it instead of starting another
+_health_lock = threading.Lock()
+_last_health = {'body': None, 'status': None, 'expires_at': 0.0}
+
 @app.route('/health', methods=['GET'])
 @limiter.exempt
 def health_check():
@@ -787,16 +1129,18 @@ def health_check():
     - Disk space
     - Core service availability
 
+    The result is reused for HEALTH_CACHE_SECONDS so frequent monitoring
+    probes don't each run a query and an HTTP call to Core.
+
     Returns:
         JSON: Detailed health status with HTTP 200 (healthy) or 503 (unhealthy/degraded)
     """
-    # Initialize health checker
-    health_checker = HealthChecker(
-        service_name='helm',
-        db=db,
-        dependencies=[
-            ('core', 'http://localhost:5000')
-        ]
-    )
-
-    return health_checker.get_health()
+    with _health_lock:
+        if time.monotonic() >= _last_health['expires_at']:
+            response, status_code = _health_checker.get_health()
+            _last_health['body'] = response.get_data()
+            _last_health['status'] = status_code
+            _last_health['expires_at'] = time.monotonic() + HEALTH_CACHE_SECONDS
+        body, status_code = _last_health['body'], _last_health['status']
+
+    return app.response_class(body, status=status_code, mimetype='application/json')
@@ -78,3 +78,41 @@ def admin_required(f):
 
         return f(*args, **kwargs)
     return decorated_function
+
+# Pre-serialized body for user_only rejections
+USER_ONLY_ERROR_BODY = b'{"error":"This endpoint is for users only"}'
+
+def _user_only_error():
+    """403 response for service calls to user-only routes"""
+    return current_app.response_class(
+        USER_ONLY_ERROR_BODY, status=403, mimetype='application/json'
+    )
+
+def user_only(f):
+    """
+    Decorator to reject service-to-service calls on user-facing routes.
+    Must be applied below @token_required or @admin_required.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if g.is_service_call:
+            return _user_only_error()
+        return f(*args, **kwargs)
+    return decorated_function
+
+def admin_user_required(f):
+    """
+    Decorator to require an admin user; service calls are rejected.
+    Equivalent to @admin_required followed by @user_only, in one wrapper.
+    """
+    @wraps(f)
+    @token_required
+    def decorated_function(*args, **kwargs):
+        if g.is_service_call:
+            return _user_only_error()
+
+        if not g.user or g.user.get('permission_level') != 'admin':
+            abort(403, description="Admin access required.")
+
+        return f(*args, **kwargs)
+    return decorated_function
@@ -0,0 +1,42 @@
+"""
+Parsed helm.conf cache for HiveMatrix Helm.
+
+The RawConfigParser for a config file is kept in a module-level cache keyed on
+the file's path, mtime and size, so repeated loads within a process reuse the
+parsed object until the file changes on disk.
+"""
+
+import configparser
+import os
+
+_cache = {}
+
+
+def load_conf(path):
+    """
+    Load an INI config file, reusing the cached parser if the file is unchanged.
+
+    Args:
+        path: Path to the config file (e.g. instance/helm.conf)
+
+    Returns:
+        RawConfigParser: Parsed config (empty if the file does not exist)
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        # Match RawConfigParser.read(), which silently skips missing files
+        return configparser.RawConfigParser()
+
+    key = (path, st.st_mtime_ns, st.st_size)
+    config = _cache.get(key)
+    if config is not None:
+        return config
+
+    config = configparser.RawConfigParser()
+    with open(path, 'rb') as f:
+        config.read_string(f.read().decode('utf-8'), source=path)
+
+    _cache.clear()
+    _cache[key] = config
+    return config
@@ -0,0 +1,94 @@
+"""
+JSON encode/decode helpers for HiveMatrix Helm.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise, so callers never need to care which backend is active.
+"""
+import hashlib
+
+from flask import current_app, request
+
+# Conditional imports - only use orjson if available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    import json
+    HAS_ORJSON = False
+
+
+def loads(data):
+    """Decode JSON from str or bytes"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """
+    Encode an object to JSON bytes.
+
+    datetime values are serialized as ISO 8601 strings by both backends.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=_default).encode('utf-8')
+
+
+def dumps_indented(obj):
+    """Encode an object to JSON bytes indented by two spaces, like json.dumps(indent=2)"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, default=_default).encode('utf-8')
+
+
+def _default(obj):
+    """Fallback encoder for types the stdlib json module does not handle"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_body():
+    """
+    Decode the request body as a JSON object with loads().
+
+    Returns None if the body is empty, malformed, or not an object. The raw
+    body is not kept on the request, so large payloads are only held once.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return None
+    try:
+        data = loads(raw)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def json_bytes(body, status=200):
+    """Build a JSON response from already-encoded bytes (e.g. a static error payload)"""
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+
+def ojsonify(obj, status=200):
+    """Drop-in replacement for flask.jsonify backed by dumps()"""
+    return current_app.response_class(dumps(obj), status=status, mimetype='application/json')
+
+
+def etagged_json_bytes(body, max_age=2):
+    """
+    Build a JSON response for pre-serialized bytes with an ETag.
+
+    Returns 304 Not Modified when the client's If-None-Match already matches,
+    so polling clients skip downloading and re-parsing unchanged data.
+    """
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+    response.headers['Cache-Control'] = f'private, max-age={max_age}'
+    return response.make_conditional(request)
+
+
+def etagged_json(obj, max_age=2):
+    """Serialize obj with dumps() and return it via etagged_json_bytes()"""
+    return etagged_json_bytes(dumps(obj), max_age=max_age)
@@ -0,0 +1,161 @@
+"""
+Recent log statistics for the Helm dashboard
+
+Last-hour log counts per (service, level) are served from the
+mv_log_counts_1h materialized view, which a background thread refreshes
+every LOG_COUNTS_REFRESH_SECONDS. Every server process runs the thread, but
+only the one holding a PostgreSQL advisory lock refreshes the view. If
+the view has not been created yet (run init_db.py), counts are aggregated
+live from log_entries instead. Results are reused for
+LOG_COUNTS_CACHE_SECONDS per set of services, so dashboard page loads and
+status polls don't each hit the database; counts are therefore at most
+LOG_COUNTS_REFRESH_SECONDS + LOG_COUNTS_CACHE_SECONDS (one minute) old.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func, text
+from sqlalchemy.exc import SQLAlchemyError
+from extensions import db
+from models import LogEntry
+
+LOG_COUNTS_VIEW = 'mv_log_counts_1h'
+LOG_COUNTS_REFRESH_SECONDS = 40
+LOG_COUNTS_CACHE_SECONDS = 20
+LOG_COUNTS_CACHE_MAX = 16
+# pg_try_advisory_xact_lock key shared by every process's refresher
+LOG_COUNTS_REFRESH_LOCK_KEY = 0x686c6d01
+
+# Guards _counts_cache and _view_available, which request threads and the
+# refresher thread both use
+_state_lock = threading.Lock()
+
+# tuple(sorted service names) -> (expires_at, {service_name: {level: count}})
+_counts_cache = {}
+
+# Flipped off when the view is missing, back on after a successful refresh
+_view_available = True
+
+
+def get_recent_log_counts(service_names):
+    """
+    Get last-hour log counts by level for the given services.
+
+    Args:
+        service_names: Iterable of service names
+
+    Returns:
+        dict: {service_name: {level: count}} with an entry for every service
+    """
+    names = list(dict.fromkeys(service_names))
+    key = tuple(sorted(names))
+    now = time.monotonic()
+
+    with _state_lock:
+        cached = _counts_cache.get(key)
+    if cached and cached[0] > now:
+        log_stats = cached[1]
+    else:
+        log_stats = _query_log_counts(names)
+        with _state_lock:
+            if len(_counts_cache) >= LOG_COUNTS_CACHE_MAX:
+                _counts_cache.clear()
+            _counts_cache[key] = (now + LOG_COUNTS_CACHE_SECONDS, log_stats)
+
+    # Callers may annotate the per-service dicts; keep the cached copy intact
+    return {service_name: dict(counts) for service_name, counts in log_stats.items()}
+
+
+def _query_log_counts(names):
+    """Read last-hour counts from the view, or aggregate them live"""
+    global _view_available
+    log_stats = {service_name: {} for service_name in names}
+
+    rows = None
+    with _state_lock:
+        view_available = _view_available
+    if view_available:
+        try:
+            rows = db.session.execute(
+                text(f"SELECT service_name, level, n FROM {LOG_COUNTS_VIEW} "
+                     "WHERE service_name = ANY(:names)"),
+                {'names': names}
+            ).all()
+        except SQLAlchemyError:
+            db.session.rollback()
+            with _state_lock:
+                _view_available = False
+
+    if rows is None:
+        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
+        rows = (
+            db.session.query(LogEntry.service_name, LogEntry.level, func.count(LogEntry.id))
+            .filter(LogEntry.timestamp >= one_hour_ago)
+            .filter(LogEntry.service_name.in_(names))
+            .group_by(LogEntry.service_name, LogEntry.level)
+            .all()
+        )
+
+    for service_name, level, count in rows:
+        log_stats[service_name][level] = count
+
+    return log_stats
+
+
+def refresh_log_counts_view(conn):
+    """Refresh the materialized view without blocking readers"""
+    global _view_available
+    conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {LOG_COUNTS_VIEW}"))
+    conn.commit()
+    with _state_lock:
+        _view_available = True
+        _counts_cache.clear()
+
+
+def _take_refresh_lock(conn):
+    """Try to become the refresher; the lock is held until conn is closed"""
+    locked = conn.execute(
+        text("SELECT pg_try_advisory_lock(:key)"),
+        {'key': LOG_COUNTS_REFRESH_LOCK_KEY}
+    ).scalar()
+    conn.commit()
+    return locked
+
+
+def start_log_counts_refresher(app, interval=LOG_COUNTS_REFRESH_SECONDS):
+    """
+    Start a daemon thread that refreshes the log counts view periodically.
+
+    The thread keeps its own connection and refreshes only while that
+    connection holds the session-level refresh lock, so with several
+    workers exactly one refreshes; the others retry the lock each interval
+    and take over if the refreshing process exits.
+    """
+    def run():
+        conn = None
+        is_refresher = False
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    if conn is None:
+                        conn = db.engine.connect()
+                        is_refresher = False
+                    if not is_refresher:
+                        is_refresher = _take_refresh_lock(conn)
+                    if is_refresher:
+                        refresh_log_counts_view(conn)
+                except SQLAlchemyError as e:
+                    app.logger.debug(f"Log counts view refresh skipped: {e}")
+                    if conn is None:
+                        continue
+                    if conn.invalidated:
+                        # The session, and the lock with it, is gone
+                        conn.close()
+                        conn = None
+                    else:
+                        conn.rollback()
+
+    refresher_thread = threading.Thread(target=run, daemon=True)
+    refresher_thread.start()
@@ -0,0 +1,233 @@
+"""
+Background log writer for /api/logs/ingest
+
+The ingest endpoint validates a batch and hands the rows to LOG_QUEUE instead
+of inserting them under the HTTP request. A daemon thread drains the queue,
+coalescing rows until HELM_LOG_BATCH_SIZE rows or HELM_LOG_BATCH_MS have
+accumulated, and writes each batch with one executemany INSERT. Once
+HELM_LOG_QUEUE_MAX rows are waiting the endpoint answers 503 so clients back
+off and retry.
+
+Batches of HELM_LOG_COPY_THRESHOLD rows or more are loaded with COPY FROM
+STDIN, which beats even multi-row INSERT at that size.
+"""
+
+import atexit
+import io
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import insert
+from extensions import db
+from models import LogEntry
+from app.json_compat import dumps
+
+LOG_BATCH_SIZE = int(os.environ.get('HELM_LOG_BATCH_SIZE', 1000))
+LOG_BATCH_MS = int(os.environ.get('HELM_LOG_BATCH_MS', 50))
+LOG_QUEUE_MAX = int(os.environ.get('HELM_LOG_QUEUE_MAX', 100000))
+LOG_COPY_THRESHOLD = int(os.environ.get('HELM_LOG_COPY_THRESHOLD', 5000))
+
+# Columns written by COPY, in row order.
+# timestamp is only sent for rows that carry one; otherwise its DEFAULT applies.
+COPY_COLUMNS = ('service_name', 'level', 'message', 'context', 'trace_id',
+                'user_id', 'hostname', 'process_id')
+
+# Each item is a list of row dicts from one ingest request. Batches vary in
+# size, so the limit is enforced on _queued_rows rather than the item count.
+LOG_QUEUE = queue.Queue()
+_queued_rows = 0
+_queued_rows_lock = threading.Lock()
+
+_writer_thread = None
+_stop = threading.Event()
+
+
+def is_running():
+    """Return True if the background writer is accepting rows"""
+    return _writer_thread is not None and _writer_thread.is_alive() and not _stop.is_set()
+
+
+def enqueue_logs(rows):
+    """
+    Queue a batch of log rows for the writer thread.
+
+    Rows without a timestamp are stamped with the arrival time here. Left to
+    the column default, every row in a coalesced batch would get the writer
+    transaction's start time, losing the order requests arrived in.
+
+    Raises:
+        queue.Full: If HELM_LOG_QUEUE_MAX or more rows are already queued
+    """
+    global _queued_rows
+
+    with _queued_rows_lock:
+        if _queued_rows >= LOG_QUEUE_MAX:
+            raise queue.Full
+        _queued_rows += len(rows)
+
+    now = datetime.utcnow()
+    for row in rows:
+        row.setdefault('timestamp', now)
+    LOG_QUEUE.put_nowait(rows)
+
+
+def _get_rows(timeout=None):
+    """Take one queued batch off LOG_QUEUE (non-blocking without a timeout)"""
+    global _queued_rows
+
+    if timeout is None:
+        rows = LOG_QUEUE.get_nowait()
+    else:
+        rows = LOG_QUEUE.get(timeout=timeout)
+    with _queued_rows_lock:
+        _queued_rows -= len(rows)
+    return rows
+
+
+def _collect_batch():
+    """Block for the first rows, then gather more until the size or time limit"""
+    try:
+        buf = list(_get_rows(timeout=1))
+    except queue.Empty:
+        return []
+
+    deadline = time.monotonic() + LOG_BATCH_MS / 1000
+    while len(buf) < LOG_BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            buf.extend(_get_rows(timeout=remaining))
+        except queue.Empty:
+            break
+    return buf
+
+
+def _copy_field(value):
+    """Encode one value for COPY's text format (tab-separated, \\N for NULL)"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (dict, list)):
+        value = dumps(value).decode('utf-8')
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+
+def _split_by_timestamp(rows):
+    """
+    Group rows by whether they carry an explicit timestamp.
+
+    executemany and COPY need a uniform column list, and rows without a
+    timestamp must omit the column entirely for the server default to fire.
+    Only synchronous ingest relies on that default (one request per
+    transaction); queued rows are stamped by enqueue_logs.
+    """
+    with_ts, without_ts = [], []
+    for row in rows:
+        (with_ts if 'timestamp' in row else without_ts).append(row)
+    return [group for group in (with_ts, without_ts) if group]
+
+
+def insert_log_rows(rows):
+    """Insert log row dicts on the current session with one executemany per column set"""
+    for group in _split_by_timestamp(rows):
+        db.session.execute(insert(LogEntry.__table__), group)
+
+
+def _copy_rows(rows):
+    """Load rows with COPY FROM STDIN on a raw psycopg2 connection"""
+    conn = db.engine.raw_connection()
+    try:
+        with conn.cursor() as cursor:
+            for group in _split_by_timestamp(rows):
+                columns = COPY_COLUMNS + ('timestamp',) if 'timestamp' in group[0] else COPY_COLUMNS
+                buf = io.StringIO()
+                for row in group:
+                    buf.write('\t'.join(_copy_field(row.get(column)) for column in columns))
+                    buf.write('\n')
+                buf.seek(0)
+                cursor.copy_expert(
+                    f"COPY {LogEntry.__tablename__} ({', '.join(columns)}) FROM STDIN", buf)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _write_batch(app, rows):
+    """
+    Insert a batch of rows with COPY (large batches) or executemany.
+
+    A batch merges rows from many already-acknowledged requests, so if it
+    fails it is retried row by row, each under its own savepoint, and only
+    the rows the database rejects are lost.
+    """
+    with app.app_context():
+        try:
+            if len(rows) >= LOG_COPY_THRESHOLD:
+                _copy_rows(rows)
+            else:
+                insert_log_rows(rows)
+                db.session.commit()
+            return
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f'Failed to write {len(rows)} queued log entries ({e}); '
+                               'retrying one row at a time')
+
+        failed = 0
+        try:
+            for row in rows:
+                try:
+                    with db.session.begin_nested():
+                        insert_log_rows([row])
+                except Exception as e:
+                    failed += 1
+                    app.logger.error(
+                        f"Dropped queued log entry from {row.get('service_name')}: {e}")
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f'Failed to write {len(rows)} queued log entries: {e}')
+            return
+        if failed:
+            app.logger.error(f'Dropped {failed} of {len(rows)} queued log entries')
+
+
+def _drain(app):
+    """Write everything still queued (used at shutdown)"""
+    rows = []
+    while True:
+        try:
+            rows.extend(_get_rows())
+        except queue.Empty:
+            break
+    if rows:
+        _write_batch(app, rows)
+
+
+def start_log_writer(app):
+    """Start the daemon thread that drains LOG_QUEUE into the database"""
+    global _writer_thread
+
+    def run():
+        while not _stop.is_set():
+            rows = _collect_batch()
+            if rows:
+                _write_batch(app, rows)
+
+    def shutdown():
+        _stop.set()
+        _writer_thread.join(timeout=5)
+        _drain(app)
+
+    _writer_thread = threading.Thread(target=run, daemon=True)
+    _writer_thread.start()
+    atexit.register(shutdown)
@@ -16,24 +16,27 @@ class PrefixMiddleware:
     def __init__(self, app, prefix=''):
         self.app = app
         self.prefix = prefix.rstrip('/')
+        self.prefix_len = len(self.prefix)
 
     def __call__(self, environ, start_response):
-        if self.prefix:
-            # Adjust SCRIPT_NAME and PATH_INFO for the prefix
-            script_name = environ.get('SCRIPT_NAME', '')
-            path_info = environ.get('PATH_INFO', '')
-
-            if path_info.startswith(self.prefix):
-                # Request came with prefix (direct access or proxy keeping prefix)
-                environ['SCRIPT_NAME'] = script_name + self.prefix
-                environ['PATH_INFO'] = path_info[len(self.prefix):]
-            else:
-                # Check for X-Script-Name header from proxy, or use prefix if proxied
-                x_script_name = environ.get('HTTP_X_SCRIPT_NAME', '')
-                if x_script_name:
-                    environ['SCRIPT_NAME'] = x_script_name
-                elif environ.get('HTTP_X_FORWARDED_HOST'):
-                    # Request came through proxy - set SCRIPT_NAME for url_for
-                    environ['SCRIPT_NAME'] = self.prefix
+        prefix = self.prefix
+        if not prefix:
+            return self.app(environ, start_response)
+
+        # Adjust SCRIPT_NAME and PATH_INFO for the prefix
+        path_info = environ.get('PATH_INFO', '')
+
+        if path_info[:self.prefix_len] == prefix:
+            # Request came with prefix (direct access or proxy keeping prefix)
+            environ['SCRIPT_NAME'] = environ.get('SCRIPT_NAME', '') + prefix
+            environ['PATH_INFO'] = path_info[self.prefix_len:]
+        else:
+            # Check for X-Script-Name header from proxy, or use prefix if proxied
+            x_script_name = environ.get('HTTP_X_SCRIPT_NAME', '')
+            if x_script_name:
+                environ['SCRIPT_NAME'] = x_script_name
+            elif environ.get('HTTP_X_FORWARDED_HOST'):
+                # Request came through proxy - set SCRIPT_NAME for url_for
+                environ['SCRIPT_NAME'] = prefix
 
         return self.app(environ, start_response)
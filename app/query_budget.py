@@ -0,0 +1,45 @@
+"""
+Per-request SQL query budget for development
+
+With HELM_QUERY_BUDGET set to a positive number, Flask-SQLAlchemy records
+the queries each request runs, and any request that runs more than the
+budget is logged as a warning with its statements. This catches N+1
+regressions (one query per service or per row) while working on routes,
+at no cost when the budget is unset.
+
+Usage in app/__init__.py (before db.init_app):
+    from app.query_budget import enable_query_recording, register_query_budget
+"""
+
+from flask import request
+from flask_sqlalchemy.record_queries import get_recorded_queries
+
+# Longest statement text included in the warning
+STATEMENT_PREVIEW_CHARS = 120
+
+
+def enable_query_recording(app):
+    """Turn on Flask-SQLAlchemy query recording; must run before db.init_app"""
+    app.config['SQLALCHEMY_RECORD_QUERIES'] = True
+
+
+def register_query_budget(app, budget):
+    """
+    Warn about requests that run more than `budget` SQL queries.
+
+    Args:
+        app: Flask application instance
+        budget: Maximum queries a single request should need
+    """
+    @app.after_request
+    def check_query_budget(response):
+        queries = get_recorded_queries()
+        if len(queries) > budget:
+            statements = '\n'.join(
+                f"  {query.statement[:STATEMENT_PREVIEW_CHARS]}" for query in queries
+            )
+            app.logger.warning(
+                f"{request.method} {request.path} ran {len(queries)} SQL queries "
+                f"(budget {budget}):\n{statements}"
+            )
+        return response
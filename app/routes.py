@@ -4,46 +4,41 @@ Web UI routes for Helm dashboard
 
 from flask import render_template, g, request, redirect, url_for, flash, jsonify
 from app import app
-from app.auth import token_required, admin_required
+from app.auth import token_required, admin_user_required, user_only
 from app.service_manager import ServiceManager
+from app.log_stats import get_recent_log_counts
+from app.template_filters import format_uptime
+from app.json_compat import dumps_indented, loads
+from config_manager import ConfigManager, atomic_write_text
 from models import LogEntry, ServiceStatus
-from datetime import datetime, timedelta, timezone
-from sqlalchemy import func
-import json
+from concurrent.futures import ThreadPoolExecutor
+import copy
 import os
+import threading
+
+HELM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MASTER_CONFIG_PATH = os.path.join(HELM_DIR, 'instance', 'configs', 'master_config.json')
+BACKUP_SCRIPT = os.path.join(HELM_DIR, 'backup.py')
+NEXUS_CERT_PATH = os.path.normpath(os.path.join(HELM_DIR, '..', 'hivematrix-nexus', 'certs', 'nexus.crt'))
+
+# Conditional imports - parse certificates in-process when cryptography is
+# available (it is installed with PyJWT[crypto])
+try:
+    from cryptography import x509
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
 
 @app.route('/')
 @token_required
+@user_only
 def index():
     """Main dashboard showing all services"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     # Get all service statuses
     statuses = ServiceManager.get_all_service_statuses()
 
-    # Get recent log statistics for all services in one query
-    one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
-    
-    counts = (
-        LogEntry.query
-        .filter(LogEntry.timestamp >= one_hour_ago)
-        .with_entities(LogEntry.service_name, LogEntry.level, func.count(LogEntry.id))
-        .group_by(LogEntry.service_name, LogEntry.level)
-        .all()
-    )
-
-    # Process the results into the desired format
-    log_stats = {}
-    for service_name, level, count in counts:
-        if service_name not in log_stats:
-            log_stats[service_name] = {}
-        log_stats[service_name][level] = count
-
-    # Ensure all services have a log_stats entry, even if empty
-    for service_name in statuses.keys():
-        if service_name not in log_stats:
-            log_stats[service_name] = {}
+    # Get recent log statistics for all services
+    log_stats = get_recent_log_counts(statuses.keys())
 
     return render_template(
         'index.html',
@@ -55,19 +50,19 @@ def index():
 
 @app.route('/service/<service_name>')
 @token_required
+@user_only
 def service_detail(service_name):
     """Detailed view of a specific service"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     try:
         status = ServiceManager.get_service_status(service_name)
     except ValueError:
         return "Service not found", 404
 
-    # Get recent logs for this service
+    # Get recent logs for this service (only the columns the template shows,
+    # as plain rows rather than ORM instances)
     recent_logs = (
         LogEntry.query
+        .with_entities(LogEntry.timestamp, LogEntry.level, LogEntry.message, LogEntry.trace_id)
         .filter_by(service_name=service_name)
         .order_by(LogEntry.timestamp.desc())
         .limit(50)
@@ -85,27 +80,13 @@ def service_detail(service_name):
 
 @app.route('/logs')
 @token_required
+@user_only
 def logs_view():
     """Log viewer with filtering"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
-    # Get filter parameters
+    # Logs themselves are fetched by the page from /api/logs; the server
+    # only renders the filter controls
     service = request.args.get('service')
     level = request.args.get('level')
-    limit = min(int(request.args.get('limit', 100)), 500)
-
-    # Build query
-    query = LogEntry.query
-
-    if service:
-        query = query.filter_by(service_name=service)
-
-    if level:
-        query = query.filter_by(level=level.upper())
-
-    # Get logs
-    logs = query.order_by(LogEntry.timestamp.desc()).limit(limit).all()
 
     # Get available services for filter
     services = ServiceManager.get_all_services()
@@ -113,7 +94,6 @@ def logs_view():
     return render_template(
         'logs.html',
         user=g.user,
-        logs=logs,
         services=services,
         selected_service=service,
         selected_level=level
@@ -122,63 +102,21 @@ def logs_view():
 
 @app.route('/metrics')
 @token_required
+@user_only
 def metrics_view():
     """Metrics and performance monitoring"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     statuses = ServiceManager.get_all_service_statuses()
 
-    # Calculate actual uptime for running services
-    for service_name, status in statuses.items():
+    # Calculate actual uptime for running services; format_uptime measures
+    # every row from the same per-request 'now' (see app/template_filters.py)
+    for status in statuses.values():
         if status.get('status') == 'running' and status.get('started_at'):
-            # Calculate uptime for running services
-            started_at = status['started_at']
-            if isinstance(started_at, str):
-                started_at = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-
-            now = datetime.now(timezone.utc)
-            # Ensure started_at is timezone-aware for comparison
-            if started_at.tzinfo is None:
-                started_at = started_at.replace(tzinfo=timezone.utc)
-            delta = now - started_at
-            total_seconds = int(delta.total_seconds())
-
-            # Format uptime
-            if total_seconds < 60:
-                uptime = f"{total_seconds}s"
-            elif total_seconds < 3600:
-                minutes = total_seconds // 60
-                uptime = f"{minutes}m"
-            elif total_seconds < 86400:
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                uptime = f"{hours}h {minutes}m" if minutes > 0 else f"{hours}h"
-            else:
-                days = total_seconds // 86400
-                hours = (total_seconds % 86400) // 3600
-                uptime = f"{days}d {hours}h" if hours > 0 else f"{days}d"
-
-            status['uptime'] = uptime
+            status['uptime'] = format_uptime(status['started_at'])
         else:
             status['uptime'] = '-'
 
-    # Get recent log statistics
-    log_stats = {}
-    for service_name in statuses.keys():
-        # Count logs by level in last hour
-        one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
-
-        counts = (
-            LogEntry.query
-            .filter(LogEntry.service_name == service_name)
-            .filter(LogEntry.timestamp >= one_hour_ago)
-            .with_entities(LogEntry.level, func.count(LogEntry.id))
-            .group_by(LogEntry.level)
-            .all()
-        )
-
-        log_stats[service_name] = {level: count for level, count in counts}
+    # Get recent log statistics for all services in one query
+    log_stats = get_recent_log_counts(statuses.keys())
 
     return render_template(
         'metrics.html',
@@ -190,11 +128,9 @@ def metrics_view():
 
 @app.route('/service/<service_name>/logs')
 @token_required
+@user_only
 def service_logs(service_name):
     """View stdout/stderr logs for a service"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     # Get query parameters
     lines = min(int(request.args.get('lines', 100)), 1000)
     log_type = request.args.get('type', 'both')  # stdout, stderr, or both
@@ -217,12 +153,9 @@ def service_logs(service_name):
 
 
 @app.route('/service/<service_name>/restart', methods=['POST'])
-@admin_required
+@admin_user_required
 def restart_service_web(service_name):
     """Restart a specific service (web UI)"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     # Don't allow restarting Helm itself
     if service_name == 'helm':
         flash('Cannot restart Helm from the web interface. Use the CLI instead.', 'warning')
@@ -245,12 +178,9 @@ def restart_service_web(service_name):
 
 
 @app.route('/users')
-@admin_required
+@admin_user_required
 def users_management():
     """User and group management page for Keycloak"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     return render_template(
         'users.html',
         user=g.user
@@ -259,31 +189,50 @@ def users_management():
 
 @app.route('/security')
 @token_required
+@user_only
 def security_dashboard():
     """Security audit and firewall configuration dashboard"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     return render_template(
         'security.html',
         user=g.user
     )
 
 
+
+# Parsed master_config.json, keyed on the file's (mtime, size)
+_master_config_cache = {}
+
+
+def _load_master_config():
+    """
+    Return the parsed master config, re-reading the file only when it changes.
+
+    The returned dict is shared; copy it before modifying.
+
+    Raises:
+        FileNotFoundError: If master_config.json does not exist
+        ValueError: If it is not valid JSON
+    """
+    st = os.stat(MASTER_CONFIG_PATH)
+    key = (st.st_mtime_ns, st.st_size)
+    config = _master_config_cache.get(key)
+    if config is None:
+        with open(MASTER_CONFIG_PATH, 'rb') as f:
+            config = loads(f.read())
+        _master_config_cache.clear()
+        _master_config_cache[key] = config
+    return config
+
+
 @app.route('/settings')
-@admin_required
+@admin_user_required
 def settings():
     """System settings page"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     # Load master config
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instance', 'configs', 'master_config.json')
     config = {}
     try:
-        with open(config_path) as f:
-            config = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        config = _load_master_config()
+    except (FileNotFoundError, ValueError):
         flash('Could not load master configuration', 'error')
 
     return render_template(
@@ -294,18 +243,12 @@ def settings():
 
 
 @app.route('/settings/save', methods=['POST'])
-@admin_required
+@admin_user_required
 def save_settings():
     """Save system settings"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instance', 'configs', 'master_config.json')
-
     try:
-        # Load existing config
-        with open(config_path) as f:
-            config = json.load(f)
+        # Load existing config (a private copy, since it is modified below)
+        config = copy.deepcopy(_load_master_config())
 
         # Update settings from form
         if 'environment' in request.form:
@@ -315,18 +258,15 @@ def save_settings():
         if 'log_level' in request.form:
             config['system']['log_level'] = request.form['log_level']
 
-        # Save config
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        # Save config, and cache what was written so the next load skips the parse
+        atomic_write_text(MASTER_CONFIG_PATH, dumps_indented(config))
+        st = os.stat(MASTER_CONFIG_PATH)
+        _master_config_cache.clear()
+        _master_config_cache[(st.st_mtime_ns, st.st_size)] = config
 
         # Auto-sync configuration to all services
         try:
-            import sys
-            sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-            from config_manager import ConfigManager
-
-            helm_dir = os.path.dirname(os.path.dirname(__file__))
-            config_mgr = ConfigManager(helm_dir)
+            config_mgr = ConfigManager(HELM_DIR)
             config_mgr.sync_all_apps()
 
             flash('Settings saved and synced to all services. Restart services for changes to take effect.', 'success')
@@ -341,19 +281,11 @@ def save_settings():
 
 
 @app.route('/settings/sync-config', methods=['POST'])
-@admin_required
+@admin_user_required
 def sync_config():
     """Sync configuration to all services"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     try:
-        import sys
-        sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-        from config_manager import ConfigManager
-
-        helm_dir = os.path.dirname(os.path.dirname(__file__))
-        config_mgr = ConfigManager(helm_dir)
+        config_mgr = ConfigManager(HELM_DIR)
         config_mgr.sync_all_apps()
 
         flash('Configuration synced to all services successfully.', 'success')
@@ -364,21 +296,33 @@ def sync_config():
     return redirect(url_for('settings'))
 
 
+# Most services restarted at once by /settings/restart-all
+RESTART_ALL_WORKERS = 16
+
+
 @app.route('/settings/restart-all', methods=['POST'])
-@admin_required
+@admin_user_required
 def restart_all_services():
     """Restart all running services"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
-
     try:
         statuses = ServiceManager.get_all_service_statuses()
+        to_restart = [
+            service_name for service_name, status in statuses.items()
+            if status.get('status') == 'running' and service_name != 'helm'
+        ]
         restarted = []
         failed = []
 
-        for service_name, status in statuses.items():
-            if status.get('status') == 'running' and service_name != 'helm':
-                result = ServiceManager.restart_service(service_name)
+        def restart(service_name):
+            # Each worker thread needs its own app context (and DB session)
+            with app.app_context():
+                return ServiceManager.restart_service(service_name)
+
+        # Restarts are mostly waiting on processes, so run them side by side
+        if to_restart:
+            with ThreadPoolExecutor(max_workers=min(RESTART_ALL_WORKERS, len(to_restart))) as pool:
+                results = list(pool.map(restart, to_restart))
+            for service_name, result in zip(to_restart, results):
                 if result.get('success'):
                     restarted.append(service_name)
                 else:
@@ -398,28 +342,47 @@ def restart_all_services():
     return redirect(url_for('settings'))
 
 
+# Serialized ssl-info response, keyed on the certificate's (mtime, size)
+_ssl_info_cache = {}
+
+
 @app.route('/settings/ssl-info')
-@admin_required
+@admin_user_required
 def ssl_info():
-    """Get SSL certificate information"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
+    """Get SSL certificate information (parsed once per certificate file version)"""
+    cert_path = NEXUS_CERT_PATH
+    cert_info = {'exists': False}
 
-    import subprocess
-    from datetime import datetime
+    try:
+        st = os.stat(cert_path)
+    except FileNotFoundError:
+        return jsonify(cert_info)
 
-    cert_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'hivematrix-nexus', 'certs', 'nexus.crt')
-    cert_info = {'exists': False}
+    key = (st.st_mtime_ns, st.st_size)
+    body = _ssl_info_cache.get(key)
+    if body is not None:
+        return app.response_class(body, mimetype='application/json')
 
-    if os.path.exists(cert_path):
-        cert_info['exists'] = True
-        cert_info['path'] = cert_path
+    cert_info['exists'] = True
+    cert_info['path'] = cert_path
+
+    try:
+        if HAS_CRYPTOGRAPHY:
+            # Parse in-process instead of forking openssl
+            with open(cert_path, 'rb') as f:
+                cert = x509.load_pem_x509_certificate(f.read())
+            expires = getattr(cert, 'not_valid_after_utc', None) or cert.not_valid_after
+            cert_info['subject'] = cert.subject.rfc4514_string()
+            # Same layout as openssl's notAfter, e.g. "Nov  9 12:00:00 2026 GMT"
+            cert_info['expires'] = f"{expires:%b} {expires.day:2d} {expires:%H:%M:%S %Y} GMT"
+            cert_info['issuer'] = cert.issuer.rfc4514_string()
+        else:
+            import subprocess
 
-        try:
             # Get certificate details using openssl
             result = subprocess.run(
                 ['openssl', 'x509', '-in', cert_path, '-noout', '-subject', '-enddate', '-issuer'],
-                capture_output=True, text=True
+                capture_output=True, text=True, timeout=5
             )
             if result.returncode == 0:
                 lines = result.stdout.strip().split('\n')
@@ -430,36 +393,84 @@ def ssl_info():
                         cert_info['expires'] = line.replace('notAfter=', '').strip()
                     elif line.startswith('issuer='):
                         cert_info['issuer'] = line.replace('issuer=', '').strip()
-        except Exception as e:
-            app.logger.error(f'Error reading certificate info: {str(e)}')
-            cert_info['error'] = 'Failed to read certificate'
+    except Exception as e:
+        app.logger.error(f'Error reading certificate info: {str(e)}')
+        cert_info['error'] = 'Failed to read certificate'
 
-    return jsonify(cert_info)
+    response = jsonify(cert_info)
+    if 'expires' in cert_info:
+        # Cache successful parses only; keep just the current certificate version
+        _ssl_info_cache.clear()
+        _ssl_info_cache[key] = response.get_data()
+    return response
 
 
-@app.route('/settings/backup', methods=['POST'])
-@admin_required
-def trigger_backup():
-    """Trigger a backup"""
-    if g.is_service_call:
-        return {'error': 'This endpoint is for users only'}, 403
+# Seconds a backup dry-run may take before it is killed
+BACKUP_DRY_RUN_TIMEOUT = 60
+
+# Held while a backup dry-run is in progress, so clicks don't stack runs
+_backup_lock = threading.Lock()
+
+
+def _run_backup_dry_run(backup_script):
+    """
+    Run backup.py --dry-run with its output appended to the 'backup' log
+    files (picked up by the log watcher), then release _backup_lock.
+    Appending keeps the output of earlier real backup runs intact.
+    """
+    import subprocess
 
     try:
-        import subprocess
-        backup_script = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backup.py')
+        stdout_path, stderr_path = ServiceManager.get_log_file_paths('backup')
 
-        if os.path.exists(backup_script):
-            # Run backup script (note: may need sudo for full backup)
-            result = subprocess.run(
+        # Don't hand Flask's reloader variables to the child
+        env = os.environ.copy()
+        for key in ['WERKZEUG_SERVER_FD', 'WERKZEUG_RUN_MAIN']:
+            env.pop(key, None)
+
+        with open(stdout_path, 'a') as stdout_file, open(stderr_path, 'a') as stderr_file:
+            process = subprocess.Popen(
                 ['python3', backup_script, '--dry-run'],
-                capture_output=True, text=True, timeout=60
+                stdout=stdout_file, stderr=stderr_file, close_fds=True, env=env
             )
-            if result.returncode == 0:
-                flash('Backup dry-run completed. Run with sudo for full backup.', 'info')
-            else:
-                flash(f'Backup check failed: {result.stderr}', 'error')
+            try:
+                returncode = process.wait(timeout=BACKUP_DRY_RUN_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                app.logger.error(f'Backup dry-run timed out after {BACKUP_DRY_RUN_TIMEOUT}s')
+                return
+
+        if returncode == 0:
+            app.logger.info('Backup dry-run completed')
         else:
+            app.logger.error(f'Backup dry-run failed (exit {returncode}), see {stderr_path}')
+    except Exception as e:
+        app.logger.error(f'Error running backup: {str(e)}')
+    finally:
+        _backup_lock.release()
+
+
+@app.route('/settings/backup', methods=['POST'])
+@admin_user_required
+def trigger_backup():
+    """Start a backup dry-run in the background"""
+    try:
+        backup_script = BACKUP_SCRIPT
+
+        if not os.path.exists(backup_script):
             flash('Backup script not found.', 'error')
+        elif not _backup_lock.acquire(blocking=False):
+            flash('A backup check is already running.', 'info')
+        else:
+            # Run backup script (note: may need sudo for full backup)
+            try:
+                threading.Thread(target=_run_backup_dry_run, args=(backup_script,), daemon=True).start()
+            except Exception:
+                _backup_lock.release()
+                raise
+            flash('Backup dry-run started; its output appears in the backup service logs. '
+                  'Run with sudo for full backup.', 'info')
 
     except Exception as e:
         app.logger.error(f'Error running backup: {str(e)}')
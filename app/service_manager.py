@@ -15,10 +15,31 @@ import time
 import requests
 import json
 import shutil
+import threading
 from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
 from flask import current_app
 from extensions import db
 from models import ServiceStatus, ServiceMetric
+from app.services_cache import load_services, apply_services_config, build_services_soa
+
+# Health probes hit every service on each status poll. Keep one pooled session
+# per thread so those connections stay alive between polls; pool_connections
+# covers one pool per service host:port.
+_health_local = threading.local()
+HEALTH_POOL_HOSTS = int(os.environ.get('HELM_HEALTH_POOL_HOSTS', 32))
+
+
+def _health_session():
+    """Return this thread's requests.Session for service health probes"""
+    session = getattr(_health_local, 'session', None)
+    if session is None:
+        session = _health_local.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HEALTH_POOL_HOSTS, pool_maxsize=2)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    return session
+
 
 class ServiceManager:
     """Manages HiveMatrix services"""
@@ -38,8 +59,9 @@ class ServiceManager:
             return
 
         try:
-            with open(helm_services_file, 'r') as f:
-                services = json.load(f)
+            # Goes through the same mtime-keyed sidecar as reload_services_config,
+            # so validating and then loading the file only decodes it once
+            services = load_services(helm_services_file)
 
             # Check if any service is missing required fields
             needs_update = False
@@ -64,12 +86,17 @@ class ServiceManager:
         if not os.path.exists(python_bin):
             python_bin = "python3"
 
-        result = subprocess.run(
-            [python_bin, "install_manager.py", "update-config"],
-            cwd=helm_dir,
-            capture_output=True,
-            text=True
-        )
+        try:
+            result = subprocess.run(
+                [python_bin, "install_manager.py", "update-config"],
+                cwd=helm_dir,
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+        except subprocess.TimeoutExpired:
+            print("Warning: Timed out regenerating service config")
+            return
 
         if result.returncode == 0:
             print("✓ Service configuration regenerated successfully")
@@ -87,11 +114,10 @@ class ServiceManager:
             ServiceManager.ensure_services_config()
 
             if os.path.exists(helm_services_file):
-                with open(helm_services_file, 'r') as f:
-                    services = json.load(f)
-                    current_app.config['SERVICES'] = services
-                    print(f"✓ Reloaded services configuration: {list(services.keys())}")
-                    return True
+                services = load_services(helm_services_file)
+                apply_services_config(current_app.config, services)
+                print(f"✓ Reloaded services configuration: {list(services.keys())}")
+                return True
             else:
                 print("WARNING: helm_services.json not found")
                 return False
@@ -176,17 +202,30 @@ class ServiceManager:
     @staticmethod
     def find_service_process(service_name, port):
         """Find a running process for a service by port"""
+        return ServiceManager.find_listening_pids([port]).get(port)
+
+    @staticmethod
+    def find_listening_pids(ports):
+        """
+        Map each port to the PID of the service process listening on it.
+
+        Scans the connection table once for all ports, rather than once per
+        service. Ports with no matching process are absent from the result.
+        """
+        wanted = {port for port in ports if port}
+        pids = {}
         for conn in psutil.net_connections(kind='inet'):
-            if conn.laddr.port == port and conn.status == 'LISTEN':
+            port = conn.laddr.port
+            if port in wanted and port not in pids and conn.status == 'LISTEN':
                 try:
                     process = psutil.Process(conn.pid)
                     proc_name = process.name().lower()
                     # Accept Python web servers (python, gunicorn, waitress) or Java (Keycloak)
                     if any(name in proc_name for name in ['python', 'java', 'gunicorn', 'waitress']):
-                        return process.pid
+                        pids[port] = process.pid
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
-        return None
+        return pids
 
     @staticmethod
     def get_log_file_paths(service_name):
@@ -478,6 +517,23 @@ class ServiceManager:
         config = ServiceManager.get_service_config(service_name)
         status = ServiceStatus.query.filter_by(service_name=service_name).first()
 
+        return ServiceManager._build_service_status(service_name, config, status)
+
+    @staticmethod
+    def _build_service_status(service_name, config, status, listening_pids=None):
+        """
+        Build the status dict for a service
+
+        Args:
+            service_name: Name of the service
+            config: Service configuration dict
+            status: ServiceStatus row for the service, or None
+            listening_pids: Optional pre-scanned {port: pid} map; scanned
+                for this service's port when omitted
+
+        Returns:
+            dict with process, database and health status
+        """
         result = {
             'service_name': service_name,
             'configured_port': config.get('port'),
@@ -491,7 +547,10 @@ class ServiceManager:
         found_running_process = False
 
         if port:
-            pid = ServiceManager.find_service_process(service_name, port)
+            if listening_pids is not None:
+                pid = listening_pids.get(port)
+            else:
+                pid = ServiceManager.find_service_process(service_name, port)
             if pid:
                 proc_info = ServiceManager.get_process_info(pid)
                 if proc_info:
@@ -531,7 +590,7 @@ class ServiceManager:
 
         for endpoint in health_endpoints:
             try:
-                response = requests.get(f"{config['url']}{endpoint}", timeout=2, verify=verify_ssl)
+                response = _health_session().get(f"{config['url']}{endpoint}", timeout=2, verify=verify_ssl)
                 if response.status_code == 200:
                     result['health'] = 'healthy'
                     result['health_message'] = f'Service responding at {endpoint}'
@@ -555,11 +614,24 @@ class ServiceManager:
     @staticmethod
     def get_all_service_statuses():
         """Get status of all configured services"""
-        services = ServiceManager.get_all_services()
-        statuses = {}
+        soa = current_app.config.get('SERVICES_SOA')
+        if soa is None:
+            soa = build_services_soa(ServiceManager.get_all_services())
+        names = soa['names']
 
-        for service_name in services:
-            statuses[service_name] = ServiceManager.get_service_status(service_name)
+        # Fetch all ServiceStatus rows in one query instead of one per service
+        rows = ServiceStatus.query.filter(ServiceStatus.service_name.in_(names)).all()
+        status_rows = {row.service_name: row for row in rows}
+
+        # Resolve every configured port with a single connection-table scan
+        listening_pids = ServiceManager.find_listening_pids(soa['ports'])
+
+        statuses = {}
+        for service_name in names:
+            config = ServiceManager.get_service_config(service_name)
+            statuses[service_name] = ServiceManager._build_service_status(
+                service_name, config, status_rows.get(service_name), listening_pids
+            )
 
         return statuses
 
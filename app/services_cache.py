@@ -0,0 +1,103 @@
+"""
+Parsed service configuration cache for HiveMatrix Helm.
+
+helm_services.json / services.json are decoded once and the result is kept in a
+pickle sidecar (e.g. helm_services.json.cache.pkl) keyed on the source file's
+mtime and size. Later worker boots load the pickle instead of re-parsing JSON.
+"""
+
+import os
+import pickle
+
+from app.json_compat import dumps, loads
+
+
+def _cache_path(path):
+    """Return the sidecar cache path for a JSON file"""
+    return f"{path}.cache.pkl"
+
+
+def load_services(path):
+    """
+    Load a services JSON file, using the pickle sidecar when it is current.
+
+    Args:
+        path: Path to the JSON file (e.g. 'helm_services.json')
+
+    Returns:
+        dict: Decoded service configuration
+
+    Raises:
+        FileNotFoundError: If the JSON file does not exist
+    """
+    st = os.stat(path)
+    header = (st.st_mtime_ns, st.st_size)
+    cache_path = _cache_path(path)
+
+    try:
+        with open(cache_path, 'rb') as f:
+            mtime_ns, size, data = pickle.load(f)
+        if (mtime_ns, size) == header:
+            return data
+    except Exception:
+        pass  # Missing or unreadable cache - fall back to parsing JSON
+
+    with open(path, 'rb') as f:
+        data = loads(f.read())
+
+    # Write the sidecar atomically so concurrent workers never see a partial file
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((header[0], header[1], data), f, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Ignore write errors (read-only filesystem, etc.)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    return data
+
+
+def build_services_json(services):
+    """
+    Serialize the /api/services response body for a services config.
+
+    Built once whenever the config is (re)loaded; see apply_services_config().
+    """
+    return dumps({
+        'services': list(services.keys()),
+        'details': services
+    })
+
+
+def build_services_soa(services):
+    """
+    Build a structure-of-arrays view of a services config.
+
+    Bulk loops (e.g. batched status checks) index these parallel lists
+    instead of walking the nested dicts for every field.
+    """
+    names = list(services.keys())
+    return {
+        'names': names,
+        'ports': [services[name].get('port') for name in names],
+        'urls': [services[name].get('url') for name in names],
+        'paths': [services[name].get('path') for name in names],
+        'name_to_idx': {name: i for i, name in enumerate(names)},
+    }
+
+
+def apply_services_config(config, services):
+    """
+    Store a services config and its derived views on a Flask config.
+
+    Args:
+        config: Flask app.config mapping
+        services: Decoded services configuration
+    """
+    config['SERVICES'] = services
+    config['SERVICES_JSON_BYTES'] = build_services_json(services)
+    config['SERVICES_SOA'] = build_services_soa(services)
@@ -0,0 +1,138 @@
+"""
+Jinja2 template filters for the Helm dashboard
+
+Usage in app/__init__.py:
+    from app.template_filters import register_template_filters
+    register_template_filters(app)
+"""
+
+import sys
+from bisect import bisect_right
+from datetime import datetime, timezone
+from functools import lru_cache
+from flask import g, has_request_context
+
+# Dashboard rows share the same timestamps across refreshes, so parsing and
+# formatting results are memoized. Uptimes of a minute or more are computed
+# against 'now' floored to a UPTIME_BUCKET_SECONDS bucket and reused within
+# it, so they can lag by up to that long; shorter uptimes are always exact.
+UPTIME_BUCKET_SECONDS = 30
+
+# datetime.fromisoformat accepts a trailing 'Z' natively from Python 3.11
+_NEEDS_Z_FIX = sys.version_info < (3, 11)
+
+_fromisoformat = lru_cache(maxsize=1024)(datetime.fromisoformat)
+
+
+def _parse_iso(timestamp_str):
+    """Parse an ISO 8601 timestamp, allowing a trailing 'Z' for UTC"""
+    if _NEEDS_Z_FIX and timestamp_str.endswith('Z'):
+        timestamp_str = timestamp_str[:-1] + '+00:00'
+    return _fromisoformat(timestamp_str)
+
+
+# Duration formatting table: bisect on the thresholds picks the row, and each
+# row is (major unit seconds, minor unit seconds, major suffix, minor suffix)
+_DURATION_THRESHOLDS = (60, 3600, 86400)
+_DURATION_UNITS = (
+    (1, None, 's', None),      # "42s"
+    (60, None, 'm', None),     # "5m"
+    (3600, 60, 'h', 'm'),      # "3h 5m" / "3h"
+    (86400, 3600, 'd', 'h'),   # "2d 4h" / "2d"
+)
+
+
+def format_duration(total_seconds):
+    """Format a number of seconds as a compact duration (e.g. '3h 5m')"""
+    major, minor, major_suffix, minor_suffix = _DURATION_UNITS[
+        bisect_right(_DURATION_THRESHOLDS, total_seconds)
+    ]
+    text = f"{total_seconds // major}{major_suffix}"
+    if minor:
+        remainder = (total_seconds % major) // minor
+        if remainder:
+            text += f" {remainder}{minor_suffix}"
+    return text
+
+
+def stamp_request_time():
+    """Capture 'now' once per request so every uptime row shares it"""
+    g._uptime_now = datetime.now(timezone.utc)
+
+
+@lru_cache(maxsize=1024)
+def format_datetime(timestamp_str):
+    """Convert ISO timestamp to human-readable format"""
+    if not timestamp_str:
+        return '-'
+
+    try:
+        # Parse ISO format timestamp
+        if isinstance(timestamp_str, str):
+            dt = _parse_iso(timestamp_str)
+        else:
+            dt = timestamp_str
+
+        # Format nicely: "Nov 19, 2025 10:09 PM"
+        return dt.strftime('%b %d, %Y %I:%M %p')
+    except Exception as e:
+        return str(timestamp_str)
+
+
+def format_uptime(timestamp_str):
+    """Convert ISO timestamp to human-readable uptime"""
+    if not timestamp_str:
+        return '-'
+
+    # One 'now' per request (stamped in before_request), shared by every row
+    now = getattr(g, '_uptime_now', None) if has_request_context() else None
+    now = now or datetime.now(timezone.utc)
+
+    total_seconds = _uptime_seconds(timestamp_str, now)
+    if total_seconds is None or total_seconds < 0:
+        return '-'
+    if total_seconds < 60 + UPTIME_BUCKET_SECONDS:
+        # Second-resolution output (or close enough that the bucketed 'now'
+        # would still land on it); a cached value would be visibly stale
+        return format_duration(total_seconds)
+    return _format_uptime_cached(timestamp_str, int(now.timestamp()) // UPTIME_BUCKET_SECONDS)
+
+
+def _uptime_seconds(timestamp_str, now):
+    """Whole seconds from a start timestamp to now, or None if unparseable"""
+    try:
+        # Parse ISO format timestamp
+        if isinstance(timestamp_str, str):
+            started_at = _parse_iso(timestamp_str)
+        else:
+            started_at = timestamp_str
+
+        # Database stores UTC; naive datetimes are assumed to be UTC
+        if started_at.tzinfo is None:
+            started_at = started_at.replace(tzinfo=timezone.utc)
+
+        return int((now - started_at).total_seconds())
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _format_uptime_cached(timestamp_str, now_bucket):
+    """Format uptime against the start of a UPTIME_BUCKET_SECONDS window"""
+    bucket_now = datetime.fromtimestamp(now_bucket * UPTIME_BUCKET_SECONDS, timezone.utc)
+    total_seconds = _uptime_seconds(timestamp_str, bucket_now)
+    if total_seconds is None or total_seconds < 0:
+        return '-'
+    return format_duration(total_seconds)
+
+
+def register_template_filters(app):
+    """
+    Register Helm's Jinja2 filters on a Flask application.
+
+    Args:
+        app: Flask application instance
+    """
+    app.before_request(stamp_request_time)
+    app.add_template_filter(format_datetime, 'format_datetime')
+    app.add_template_filter(format_uptime, 'format_uptime')
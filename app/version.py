@@ -42,34 +42,21 @@ def get_version():
     return "unknown"
 
 def _get_version_from_git(repo_dir):
-    """Try to get version from git."""
+    """Try to get version from git (one git process for hash and date)."""
     try:
-        # Get short git commit hash
+        # Short commit hash and commit date (format: c7f7c81 2024-11-19 14:30:00 -0500)
         result = subprocess.run(
-            ['git', 'rev-parse', '--short', 'HEAD'],
+            ['git', 'log', '-1', '--format=%h %ci'],
             capture_output=True,
             text=True,
             cwd=repo_dir
         )
-        if result.returncode != 0:
+        if result.returncode != 0 or not result.stdout.strip():
             return None
-        commit_hash = result.stdout.strip()
+        commit_hash, date_str = result.stdout.split()[:2]
 
-        # Get commit date
-        result = subprocess.run(
-            ['git', 'log', '-1', '--format=%ci'],
-            capture_output=True,
-            text=True,
-            cwd=repo_dir
-        )
-
-        if result.returncode == 0:
-            # Parse the date (format: 2024-11-19 14:30:00 -0500)
-            date_str = result.stdout.strip().split()[0]
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            date_formatted = date_obj.strftime('%Y.%m.%d')
-        else:
-            date_formatted = datetime.now().strftime('%Y.%m.%d')
+        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+        date_formatted = date_obj.strftime('%Y.%m.%d')
 
         return f"{date_formatted}-{commit_hash}"
 
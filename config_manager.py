@@ -6,10 +6,38 @@ Manages all configuration for all HiveMatrix applications
 
 import os
 import json
+import stat
 import configparser
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+def atomic_write_text(path, content):
+    """
+    Replace path with content (str, or already-encoded bytes) atomically.
+
+    The data is written and fsynced to a sibling temp file, which is then
+    os.replace'd over path, so readers see either the old or the new file,
+    never a truncated one. An existing file's permission bits are kept.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb' if isinstance(content, bytes) else 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
 class ConfigManager:
     """
     Centralized configuration manager for all HiveMatrix apps
@@ -75,8 +103,7 @@ class ConfigManager:
 
     def save_master_config(self):
         """Save master configuration"""
-        with open(self.master_config_file, 'w') as f:
-            json.dump(self.master_config, f, indent=2)
+        atomic_write_text(self.master_config_file, json.dumps(self.master_config, indent=2))
 
     def get_app_config(self, app_name: str) -> Dict[str, Any]:
         """Get configuration for a specific app"""
@@ -221,17 +248,33 @@ class ConfigManager:
 
         return "\n".join(lines) + "\n"
 
-    def write_app_dotenv(self, app_name: str):
-        """Write .flaskenv file for an app"""
+    @staticmethod
+    def _write_if_changed(path: Path, content: str) -> bool:
+        """Write content to path unless the file already holds exactly that; returns True if written"""
+        if not ConfigManager._file_differs(path, content):
+            return False
+        atomic_write_text(path, content)
+        return True
+
+    @staticmethod
+    def _file_differs(path: Path, content: str) -> bool:
+        """Return True if path is missing or does not hold exactly content"""
+        try:
+            return path.read_bytes() != content.encode('utf-8')
+        except FileNotFoundError:
+            return True
+
+    def _render_app_dotenv(self, app_name: str):
+        """Return (path, content) of the .flaskenv file for an app"""
         app_dir = self.parent_dir / f"hivematrix-{app_name}"
         if not app_dir.exists():
             raise FileNotFoundError(f"App directory not found: {app_dir}")
 
-        dotenv_path = app_dir / ".flaskenv"
-        content = self.generate_app_dotenv(app_name)
+        return app_dir / ".flaskenv", self.generate_app_dotenv(app_name)
 
-        with open(dotenv_path, 'w') as f:
-            f.write(content)
+    def write_app_dotenv(self, app_name: str) -> bool:
+        """Write .flaskenv file for an app; returns False if it was already up to date"""
+        return self._write_if_changed(*self._render_app_dotenv(app_name))
 
     def generate_app_conf(self, app_name: str) -> str:
         """Generate instance/app.conf content for an app"""
@@ -264,8 +307,8 @@ class ConfigManager:
         conf.write(output)
         return output.getvalue()
 
-    def write_app_conf(self, app_name: str):
-        """Write instance/app.conf file for an app"""
+    def _render_app_conf(self, app_name: str):
+        """Return (path, content) of instance/app.conf for an app; content is None if there is nothing to write"""
         app_dir = self.parent_dir / f"hivematrix-{app_name}"
         if not app_dir.exists():
             raise FileNotFoundError(f"App directory not found: {app_dir}")
@@ -308,10 +351,16 @@ class ConfigManager:
 
             output = StringIO()
             new_conf.write(output)
-            content = output.getvalue()
+            return conf_path, output.getvalue()
+
+        return conf_path, None
 
-            with open(conf_path, 'w') as f:
-                f.write(content)
+    def write_app_conf(self, app_name: str) -> bool:
+        """Write instance/app.conf file for an app; returns False if it was already up to date"""
+        conf_path, content = self._render_app_conf(app_name)
+        if content is None:
+            return False
+        return self._write_if_changed(conf_path, content)
 
     def backup_app_configs(self, app_name: str):
         """
@@ -350,6 +399,8 @@ class ConfigManager:
         Sync configuration to all installed apps with automatic backups.
 
         Creates timestamped backups before modifying any config files.
+        Apps whose files already match the generated content are left
+        untouched (no backup, no write).
         """
         from install_manager import InstallManager
 
@@ -358,12 +409,22 @@ class ConfigManager:
 
         for app_name in installed_apps:
             try:
+                # Render both files first so unchanged apps can be skipped
+                files = [self._render_app_dotenv(app_name), self._render_app_conf(app_name)]
+                changed = [
+                    (path, content) for path, content in files
+                    if content is not None and self._file_differs(path, content)
+                ]
+                if not changed:
+                    print(f"✓ Configuration for {app_name} already up to date")
+                    continue
+
                 # ALWAYS create backup before syncing
                 self.backup_app_configs(app_name)
 
                 # Now safe to sync
-                self.write_app_dotenv(app_name)
-                self.write_app_conf(app_name)
+                for path, content in changed:
+                    atomic_write_text(path, content)
                 print(f"✓ Synced configuration for {app_name}")
             except Exception as e:
                 print(f"✗ Failed to sync {app_name}: {e}")
@@ -0,0 +1,59 @@
+"""
+Gunicorn configuration for running Helm in production
+
+    gunicorn -c gunicorn.conf.py "app:app"
+
+Most Helm request time is spent waiting on Keycloak and PostgreSQL, so a
+single gevent worker serving many concurrent connections goes further than
+a pool of sync workers. One worker also keeps the in-process rate limiter
+counters and log ingest queue in a single place. If gevent is not installed
+this falls back to a threaded worker.
+
+The log file watcher blocks on inotify reads, which would stall a gevent
+worker, so it is disabled here; run `python log_watcher.py` alongside
+gunicorn instead.
+"""
+
+import os
+
+# Conditional imports - only use gevent/psycogreen if available
+try:
+    import gevent  # noqa: F401
+    HAS_GEVENT = True
+except ImportError:
+    HAS_GEVENT = False
+
+try:
+    from psycogreen.gevent import patch_psycopg
+    HAS_PSYCOGREEN = True
+except ImportError:
+    HAS_PSYCOGREEN = False
+
+# Security: Bind to localhost only - Helm is reached through the Nexus proxy
+bind = os.environ.get('HELM_BIND', '127.0.0.1:5004')
+workers = int(os.environ.get('HELM_WORKERS', 1))
+
+if HAS_GEVENT:
+    # The gevent worker monkey-patches the stdlib before the app is imported
+    worker_class = 'gevent'
+    worker_connections = int(os.environ.get('HELM_WORKER_CONNECTIONS', 200))
+else:
+    worker_class = 'gthread'
+    threads = int(os.environ.get('HELM_THREADS', 16))
+
+timeout = 120
+raw_env = ['HELM_LOG_WATCHER=false']
+
+
+def post_fork(server, worker):
+    """Make psycopg2 yield to other greenlets while waiting on PostgreSQL"""
+    if HAS_GEVENT and HAS_PSYCOGREEN:
+        patch_psycopg()
+    elif HAS_GEVENT:
+        server.log.warning("psycogreen not installed; database calls will block the gevent worker")
+
+
+def post_worker_init(worker):
+    """Start the log writer and log counts refresher once the app is loaded"""
+    from app import start_background_workers
+    start_background_workers()
@@ -52,7 +52,7 @@ class HelmLogger:
                 },
                 timeout=5
             )
-            if response.status_code != 200:
+            if response.status_code not in (200, 202):  # 202 = queued for writing
                 self.local_logger.warning(f"Failed to send logs to Helm: {response.text}")
         except Exception as e:
             self.local_logger.warning(f"Failed to send logs to Helm: {e}")
@@ -7,11 +7,18 @@ Handles app installation, dependency management, and configuration
 import os
 import sys
 import json
-import subprocess
-import shutil
+import hashlib
+import configparser
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# Conditional imports - read git state in-process with libgit2 when available
+try:
+    import pygit2
+    HAS_PYGIT2 = True
+except ImportError:
+    HAS_PYGIT2 = False
+
 # Service display order for sidebar (front to back)
 # Services not in this list will be appended alphabetically
 SERVICE_ORDER = [
@@ -27,6 +34,44 @@ SERVICE_ORDER = [
     'keycloak'      # Auth provider (not visible)
 ]
 
+# Position of each service in SERVICE_ORDER, for O(1) sort keys
+SERVICE_RANK = {name: rank for rank, name in enumerate(SERVICE_ORDER)}
+
+# Seconds a git network command may go without printing anything before it's
+# treated as stalled and killed
+GIT_IDLE_TIMEOUT = 30
+
+# Parallel submodule fetches per clone/pull
+GIT_SUBMODULE_JOBS = 4
+
+# Config for every clone/pull: protocol v2 (server-side ref filtering) and
+# parallel submodule fetches
+GIT_FETCH_CONFIG = ['-c', 'protocol.version=2', '-c', f'submodule.fetchJobs={GIT_SUBMODULE_JOBS}']
+
+# Hash of the requirements.txt last installed into an app's venv
+REQUIREMENTS_STAMP = "pyenv/.requirements.sha256"
+
+# Services hidden from the sidebar (visible: false)
+HIDDEN_SERVICES = frozenset(('core', 'nexus'))
+
+# Fields copied from helm_services.json into the public services.json view
+PUBLIC_SERVICE_FIELDS = ('url', 'visible', 'admin_only')
+
+# Serializes service config writes made in the background during installs
+# (created on first install, so read-only commands don't load the executor)
+_config_executor = None
+
+# parent_dir -> (mtime_ns, directory names) for InstallManager._service_dir_names
+_dir_names_cache = {}
+
+def _get_config_executor():
+    """Return the shared single-worker executor for service config writes"""
+    global _config_executor
+    if _config_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _config_executor = ThreadPoolExecutor(max_workers=1)
+    return _config_executor
+
 class InstallManager:
     def __init__(self, helm_dir: str = None):
         self.helm_dir = Path(helm_dir) if helm_dir else Path(__file__).parent
@@ -34,13 +79,25 @@ class InstallManager:
         self.apps_registry_file = self.helm_dir / "apps_registry.json"
         self.helm_services_json = self.helm_dir / "helm_services.json"  # Full config for Helm only
         self.services_json = self.helm_dir / "services.json"  # URLs only, symlinked to other services
+        self.mirror_dir = self.parent_dir / ".helm-mirrors"  # Bare git mirrors, one per git_url
+
+        # Serve clones from a local mirror so reinstalls don't refetch packs
+        self.use_mirror = os.environ.get('HELM_GIT_MIRROR', 'false').lower() in ('true', '1', 'yes')
 
         # Load registry
         with open(self.apps_registry_file, 'r') as f:
             self.registry = json.load(f)
 
+        # Flat app_key -> app info lookup over core_apps and default_apps
+        # (core entries win if a key appears in both)
+        self.apps = dict(self.registry['core_apps'])
+        for app_key, app_info in self.registry['default_apps'].items():
+            self.apps.setdefault(app_key, app_info)
+
     def check_system_dependencies(self) -> Dict[str, bool]:
         """Check which system dependencies are installed"""
+        import subprocess
+
         results = {}
 
         # Check PostgreSQL
@@ -107,6 +164,8 @@ class InstallManager:
 
     def _install_postgresql(self) -> Tuple[bool, str]:
         """Install PostgreSQL"""
+        import subprocess
+
         try:
             print("Installing PostgreSQL...")
             subprocess.run([
@@ -129,6 +188,8 @@ class InstallManager:
 
     def _install_keycloak(self) -> Tuple[bool, str]:
         """Download and setup Keycloak"""
+        import subprocess
+
         try:
             keycloak_dir = self.parent_dir / "keycloak-26.4.0"
             if keycloak_dir.exists():
@@ -155,6 +216,8 @@ class InstallManager:
 
     def _install_neo4j(self) -> Tuple[bool, str]:
         """Install Neo4j"""
+        import subprocess
+
         try:
             print("Installing Neo4j...")
             # Add Neo4j repository
@@ -171,11 +234,21 @@ class InstallManager:
         except subprocess.CalledProcessError as e:
             return False, f"Failed to install Neo4j: {e}"
 
-    def clone_app(self, app_key: str) -> Tuple[bool, str]:
-        """Clone an app from git"""
-        # Check in both core_apps and default_apps
-        app_info = self.registry['core_apps'].get(app_key) or \
-                   self.registry['default_apps'].get(app_key)
+    def clone_app(self, app_key: str, full_history: bool = False) -> Tuple[bool, str]:
+        """
+        Clone an app from git.
+
+        By default only the latest commit of the default branch is fetched
+        (shallow, single-branch clone); `git pull` keeps working on it. Pass full_history=True for a
+        regular clone with all history and tags.
+
+        With HELM_GIT_MIRROR enabled, the repo is first mirrored (or the
+        mirror updated) under .helm-mirrors and the clone borrows its objects,
+        so reinstalls transfer almost nothing from the remote.
+        """
+        import subprocess
+
+        app_info = self.apps.get(app_key)
 
         if not app_info:
             return False, f"Unknown app: {app_key}"
@@ -187,20 +260,198 @@ class InstallManager:
 
         try:
             print(f"Cloning {app_info['name']}...")
-            subprocess.run([
-                'git', 'clone', app_info['git_url'], str(app_dir)
-            ], check=True, cwd=str(self.parent_dir))
+            mirror = self._update_mirror(app_key, app_info['git_url']) if self.use_mirror else None
+            if mirror:
+                clone_args = ['--reference-if-able', str(mirror), '--dissociate']
+            elif full_history:
+                clone_args = []
+            else:
+                clone_args = ['--depth=1', '--single-branch', '--shallow-submodules']
+            self._run_prefixed(
+                ['git', *GIT_FETCH_CONFIG, 'clone', '--progress', '--recurse-submodules',
+                 f'--jobs={GIT_SUBMODULE_JOBS}', *clone_args, app_info['git_url'], str(app_dir)],
+                cwd=self.parent_dir, prefix=app_key
+            )
 
             return True, f"{app_key} cloned successfully"
         except subprocess.CalledProcessError as e:
             return False, f"Failed to clone {app_key}: {e}"
 
-    def install_app(self, app_key: str) -> Tuple[bool, str]:
-        """Install an app (clone + run install.sh)"""
+    def _update_mirror(self, app_key: str, git_url: str) -> Optional[Path]:
+        """
+        Create or refresh the bare mirror for git_url.
+
+        Returns the mirror path, or None if it could not be brought up to
+        date (the clone then goes straight to the remote).
+        """
+        import subprocess
+
+        mirror = self.mirror_dir / hashlib.sha1(git_url.encode()).hexdigest()
+        try:
+            if mirror.exists():
+                self._run_prefixed(['git', *GIT_FETCH_CONFIG, '-C', str(mirror), 'remote', 'update', '--prune'],
+                                   cwd=self.parent_dir, prefix=app_key)
+            else:
+                self.mirror_dir.mkdir(exist_ok=True)
+                self._run_prefixed(['git', *GIT_FETCH_CONFIG, 'clone', '--progress', '--mirror', git_url, str(mirror)],
+                                   cwd=self.parent_dir, prefix=app_key)
+            return mirror
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"  Warning: git mirror for {app_key} unavailable, cloning directly: {e}")
+            return None
+
+    @staticmethod
+    def _run_prefixed(cmd: List[str], cwd: Path, prefix: str, idle_timeout: float = GIT_IDLE_TIMEOUT):
+        """
+        Run a non-interactive command, echoing its output line by line as it
+        arrives with a [prefix] tag, so concurrent clones stay readable.
+
+        The command is killed if it prints nothing for idle_timeout seconds,
+        so a dead remote fails fast instead of hanging the install.
+
+        Raises:
+            subprocess.CalledProcessError: If the command exits non-zero or stalls
+        """
+        import signal
+        import subprocess
+        import threading
+        import time
+
+        # Own process group, so a stall kill also reaps git's helper
+        # processes (remote-https, index-pack) that hold the output pipe
+        with subprocess.Popen(cmd, cwd=str(cwd), stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT, text=True, bufsize=1,
+                              start_new_session=True) as process:
+            last_output = time.monotonic()
+            finished = threading.Event()
+            stalled = threading.Event()
+
+            def kill_group():
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except OSError:
+                    process.kill()
+
+            def watchdog():
+                while not finished.wait(1):
+                    if time.monotonic() - last_output > idle_timeout:
+                        stalled.set()
+                        kill_group()
+                        return
+
+            threading.Thread(target=watchdog, daemon=True).start()
+            try:
+                # Universal newlines split git's \r progress updates into lines
+                for line in process.stdout:
+                    last_output = time.monotonic()
+                    print(f"  [{prefix}] {line.rstrip()}", flush=True)
+            except BaseException:
+                # The group doesn't get the terminal's Ctrl-C, so stop it here
+                kill_group()
+                raise
+            finally:
+                finished.set()
+        if stalled.is_set():
+            print(f"  [{prefix}] No output for {idle_timeout}s, aborted", flush=True)
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, cmd)
+
+    def install_app(self, app_key: str, full_history: bool = False) -> Tuple[bool, str]:
+        """
+        Install an app (clone + run install.sh) and register it in the
+        service configs.
+
+        The registration only needs the registry's port, so it is written on
+        a background thread while the clone runs, and rolled back if the
+        install fails.
+        """
+        if app_key not in self.apps:
+            return False, f"Unknown app: {app_key}"
+
+        registration = _get_config_executor().submit(self.register_app, app_key)
+
         # Clone the app
-        success, message = self.clone_app(app_key)
-        if not success:
-            return False, message
+        success, message = self.clone_app(app_key, full_history=full_history)
+        if success:
+            success, message = self._run_install_script(app_key)
+
+        registration_error = self._settle_registration(app_key, registration, success)
+        if success and registration_error:
+            return False, f"registration failed: {registration_error}"
+        return success, message
+
+    def install_apps(self, app_keys: List[str], full_history: bool = False,
+                     max_workers: int = 4) -> Dict[str, Tuple[bool, str]]:
+        """
+        Install several apps.
+
+        Clones are network-bound and target separate directories, so up to
+        max_workers run at once. Install scripts then run one at a time, in
+        the order given, since they may contend for apt/pip/database locks.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        app_keys = list(dict.fromkeys(app_keys))
+        registrations = {
+            app_key: _get_config_executor().submit(self.register_app, app_key)
+            for app_key in app_keys if app_key in self.apps
+        }
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            clones = {
+                app_key: pool.submit(self.clone_app, app_key, full_history)
+                for app_key in app_keys
+            }
+
+        results = {}
+        for app_key, future in clones.items():
+            success, message = future.result()
+            results[app_key] = self._run_install_script(app_key) if success else (False, message)
+            if app_key in registrations:
+                registration_error = self._settle_registration(
+                    app_key, registrations[app_key], results[app_key][0])
+                if results[app_key][0] and registration_error:
+                    results[app_key] = (False, f"registration failed: {registration_error}")
+        return results
+
+    def _settle_registration(self, app_key: str, registration,
+                             installed: bool) -> Optional[str]:
+        """
+        Wait for a background register_app, rolling it back if it failed or
+        the install failed.
+
+        Only helm_services.json and services.json are touched; self.apps (the
+        registry) is never written.
+
+        Returns:
+            The registration error, or None if the app is registered (or
+            was never meant to be, because the install failed)
+        """
+        error = None
+        try:
+            added = registration.result()
+        except Exception as e:
+            print(f"  Warning: could not register {app_key} in service config: {e}")
+            error = str(e) or type(e).__name__
+            # register_app may have written helm_services.json but not services.json
+            added, installed = True, False
+
+        if added and not installed:
+            try:
+                _get_config_executor().submit(self.unregister_app, app_key).result()
+            except Exception as e:
+                print(f"  Warning: could not unregister {app_key} from service config: {e}")
+        return error
+
+    def _run_install_script(self, app_key: str) -> Tuple[bool, str]:
+        """
+        Run a cloned app's install.sh, if it has one.
+
+        Skipped when the venv exists and requirements.txt hashes to the value
+        stamped in pyenv/.requirements.sha256 by the last successful install
+        (the same stamp the ./install script uses).
+        """
+        import subprocess
 
         app_dir = self.parent_dir / f"hivematrix-{app_key}"
         install_script = app_dir / "install.sh"
@@ -209,29 +460,70 @@ class InstallManager:
             print(f"  No install.sh found for {app_key}, skipping...")
             return True, f"{app_key} cloned (no install script)"
 
+        requirements_hash = self._requirements_hash(app_dir)
+        stamp = app_dir / REQUIREMENTS_STAMP
+        if requirements_hash and (app_dir / "pyenv" / "bin" / "python").exists():
+            try:
+                if stamp.read_text().strip() == requirements_hash:
+                    print(f"  Requirements unchanged for {app_key}, skipping install.sh")
+                    return True, f"{app_key} is up to date"
+            except FileNotFoundError:
+                pass
+
         try:
             print(f"Running install script for {app_key}...")
-            # Make it executable
-            subprocess.run(['chmod', '+x', str(install_script)], check=True)
+            # Make it executable (u/g/o +x, like chmod +x, without spawning a process)
+            mode = install_script.stat().st_mode
+            install_script.chmod(mode | 0o111)
 
             # Run it
             subprocess.run([str(install_script)], check=True, cwd=str(app_dir))
 
+            if requirements_hash and stamp.parent.is_dir():
+                stamp.write_text(requirements_hash + "\n")
+
             return True, f"{app_key} installed successfully"
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError) as e:
             return False, f"Failed to install {app_key}: {e}"
 
+    @staticmethod
+    def _requirements_hash(app_dir: Path) -> Optional[str]:
+        """sha256 of the app's requirements.txt, or None if it has none"""
+        try:
+            return hashlib.sha256((app_dir / "requirements.txt").read_bytes()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    def _service_dir_names(self) -> frozenset:
+        """
+        Names of all directories in parent_dir, read with a single scandir.
+
+        The result is cached per process keyed on parent_dir's mtime, which
+        changes whenever an entry is added, removed or renamed.
+        """
+        mtime_ns = os.stat(self.parent_dir).st_mtime_ns
+        cached = _dir_names_cache.get(self.parent_dir)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        with os.scandir(self.parent_dir) as entries:
+            names = frozenset(entry.name for entry in entries if entry.is_dir())
+        _dir_names_cache[self.parent_dir] = (mtime_ns, names)
+        return names
+
     def get_installed_apps(self) -> List[str]:
         """Get list of installed apps"""
-        installed = []
-        for app_key in list(self.registry['core_apps'].keys()) + list(self.registry['default_apps'].keys()):
-            app_dir = self.parent_dir / f"hivematrix-{app_key}"
-            if app_dir.exists():
-                installed.append(app_key)
-        return installed
+        dir_names = self._service_dir_names()
+        return [
+            app_key
+            for app_key in self.apps
+            if f"hivematrix-{app_key}" in dir_names
+        ]
 
     def get_app_status(self, app_key: str) -> Dict:
         """Get detailed status of an app"""
+        import subprocess
+
         app_dir = self.parent_dir / f"hivematrix-{app_key}"
 
         status = {
@@ -247,18 +539,7 @@ class InstallManager:
 
         try:
             # Get git remote URL
-            result = subprocess.run(
-                ['git', 'remote', 'get-url', 'origin'],
-                capture_output=True, text=True, check=True, cwd=str(app_dir)
-            )
-            status['git_url'] = result.stdout.strip()
-
-            # Get current branch
-            result = subprocess.run(
-                ['git', 'branch', '--show-current'],
-                capture_output=True, text=True, check=True, cwd=str(app_dir)
-            )
-            status['git_branch'] = result.stdout.strip()
+            status['git_url'] = self._read_origin_url(app_dir)
 
             # Check for updates (fetch first)
             subprocess.run(
@@ -266,29 +547,93 @@ class InstallManager:
                 capture_output=True, check=True, cwd=str(app_dir)
             )
 
-            # Check if behind remote
-            result = subprocess.run(
-                ['git', 'rev-list', '--count', 'HEAD..@{u}'],
-                capture_output=True, text=True, check=True, cwd=str(app_dir)
-            )
-            commits_behind = int(result.stdout.strip())
-            status['has_updates'] = commits_behind > 0
-            status['commits_behind'] = commits_behind
-
-            # Get git status
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                capture_output=True, text=True, check=True, cwd=str(app_dir)
-            )
-            status['git_status'] = 'clean' if not result.stdout.strip() else 'modified'
+            branch, commits_behind, modified = self._read_git_state(app_dir)
+            status['git_branch'] = branch
+            if commits_behind is not None:
+                status['has_updates'] = commits_behind > 0
+                status['commits_behind'] = commits_behind
+            status['git_status'] = 'modified' if modified else 'clean'
 
         except subprocess.CalledProcessError:
             pass
 
         return status
 
+    @staticmethod
+    def _read_origin_url(app_dir: Path) -> str:
+        """
+        Return the origin remote URL, read straight from .git/config.
+
+        Falls back to 'git remote get-url origin' when the config can't be
+        read directly (e.g. .git is a worktree file) or has no plain origin URL.
+        """
+        import subprocess
+
+        git_config = app_dir / '.git' / 'config'
+        if git_config.is_file():
+            parser = configparser.RawConfigParser(strict=False)
+            try:
+                parser.read(git_config)
+                url = parser.get('remote "origin"', 'url', fallback=None)
+                if url:
+                    return url.strip()
+            except configparser.Error:
+                pass
+
+        result = subprocess.run(
+            ['git', 'remote', 'get-url', 'origin'],
+            capture_output=True, text=True, check=True, cwd=str(app_dir)
+        )
+        return result.stdout.strip()
+
+    @staticmethod
+    def _read_git_state(app_dir: Path) -> Tuple[str, Optional[int], bool]:
+        """
+        Return (branch, commits behind upstream or None, has local changes).
+
+        Uses pygit2 when installed, otherwise one
+        'git status --porcelain=v2 --branch' call.
+        """
+        import subprocess
+
+        if HAS_PYGIT2:
+            try:
+                repo = pygit2.Repository(str(app_dir))
+                commits_behind = None
+                if repo.head_is_detached:
+                    branch = ''
+                else:
+                    branch = repo.head.shorthand
+                    upstream = repo.branches.local[branch].upstream
+                    if upstream is not None:
+                        _, commits_behind = repo.ahead_behind(repo.head.target, upstream.target)
+                modified = any(
+                    flags != pygit2.GIT_STATUS_IGNORED for flags in repo.status().values()
+                )
+                return branch, commits_behind, modified
+            except (pygit2.GitError, KeyError):
+                pass  # Unusual repo state - let the git CLI report it
+
+        result = subprocess.run(
+            ['git', 'status', '--porcelain=v2', '--branch'],
+            capture_output=True, text=True, check=True, cwd=str(app_dir)
+        )
+        branch, commits_behind, modified = '', None, False
+        for line in result.stdout.splitlines():
+            if line.startswith('# branch.head '):
+                head = line[len('# branch.head '):]
+                branch = '' if head == '(detached)' else head
+            elif line.startswith('# branch.ab '):
+                # "# branch.ab +<ahead> -<behind>"; absent without an upstream
+                commits_behind = int(line.split()[3].lstrip('-'))
+            elif not line.startswith('#'):
+                modified = True
+        return branch, commits_behind, modified
+
     def git_pull_app(self, app_key: str) -> Tuple[bool, str]:
         """Pull latest changes for an app"""
+        import subprocess
+
         app_dir = self.parent_dir / f"hivematrix-{app_key}"
 
         if not app_dir.exists():
@@ -296,7 +641,7 @@ class InstallManager:
 
         try:
             result = subprocess.run(
-                ['git', 'pull'],
+                ['git', *GIT_FETCH_CONFIG, 'pull', '--recurse-submodules'],
                 capture_output=True, text=True, check=True, cwd=str(app_dir)
             )
             return True, result.stdout.strip()
@@ -308,28 +653,24 @@ class InstallManager:
         discovered = {}
 
         # Scan for all hivematrix-* directories
-        for item in self.parent_dir.iterdir():
-            if not item.is_dir():
-                continue
-
+        for name in sorted(self._service_dir_names()):
             # Check if it's a hivematrix service
-            if not item.name.startswith('hivematrix-'):
+            if not name.startswith('hivematrix-'):
                 continue
 
             # Skip helm itself
-            if item.name == 'hivematrix-helm':
+            if name == 'hivematrix-helm':
                 continue
 
             # Check if it has run.py (indicates it's a Flask service)
-            if not (item / 'run.py').exists():
+            if not os.path.exists(os.path.join(self.parent_dir, name, 'run.py')):
                 continue
 
             # Extract service name
-            service_name = item.name.replace('hivematrix-', '')
+            service_name = name.replace('hivematrix-', '')
 
             # Check if it's in the registry
-            app_info = self.registry['core_apps'].get(service_name) or \
-                      self.registry['default_apps'].get(service_name)
+            app_info = self.apps.get(service_name)
 
             if app_info:
                 # Use registry info
@@ -357,8 +698,7 @@ class InstallManager:
         """
         # Scan for all services
         discovered = self.scan_all_services()
-        helm_services = {}  # Full config for Helm
-        public_services = {}  # URLs only for other services
+        helm_services = {}  # Full config for Helm; services.json is derived from it
 
         # Add Keycloak if installed
         version_file = self.helm_dir / "keycloak_version.conf"
@@ -380,11 +720,6 @@ class InstallManager:
                 "visible": False,
                 "admin_only": True
             }
-            public_services['keycloak'] = {
-                "url": "http://localhost:8080",
-                "visible": False,
-                "admin_only": True
-            }
 
         # Add Helm (the orchestration service itself)
         helm_services['helm'] = {
@@ -396,52 +731,100 @@ class InstallManager:
             "visible": True,
             "admin_only": True
         }
-        public_services['helm'] = {
-            "url": "http://localhost:5004",
-            "visible": True,
-            "admin_only": True
-        }
 
         # Add all discovered services
         for service_name, app_info in discovered.items():
-            protocol = "https" if service_name == "nexus" and app_info['port'] == 443 else "http"
-            url = f"{protocol}://localhost:{app_info['port']}"
-            visible = service_name not in ['core', 'nexus']
-
-            # Full config for Helm
-            helm_services[service_name] = {
-                "url": url,
-                "path": f"../hivematrix-{service_name}",
-                "port": app_info['port'],
-                "python_bin": "pyenv/bin/python",
-                "run_script": "run.py",
-                "visible": visible
-            }
+            helm_services[service_name] = self._service_entry(service_name, app_info['port'])
+
+        self._write_service_configs(helm_services)
+
+    @staticmethod
+    def _service_entry(service_name: str, port: int) -> Dict:
+        """Full helm_services.json entry for a hivematrix-<name> Flask service"""
+        protocol = "https" if service_name == "nexus" and port == 443 else "http"
+        return {
+            "url": f"{protocol}://localhost:{port}",
+            "path": f"../hivematrix-{service_name}",
+            "port": port,
+            "python_bin": "pyenv/bin/python",
+            "run_script": "run.py",
+            "visible": service_name not in HIDDEN_SERVICES
+        }
 
-            # Public config includes URL and visibility (for Nexus sidebar)
-            public_services[service_name] = {
-                "url": url,
-                "visible": visible
-            }
+    def _load_helm_services(self) -> Dict:
+        """Current helm_services.json contents (empty if not generated yet)"""
+        try:
+            with open(self.helm_services_json) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def register_app(self, app_key: str) -> bool:
+        """
+        Add a registry app to helm_services.json and services.json.
+
+        Returns True if the app was newly added, False if already present.
+        """
+        helm_services = self._load_helm_services()
+        if app_key in helm_services:
+            return False
+
+        helm_services[app_key] = self._service_entry(app_key, self.apps[app_key]['port'])
+        self._write_service_configs(helm_services)
+        return True
+
+    def unregister_app(self, app_key: str) -> bool:
+        """Remove an app from helm_services.json and services.json"""
+        helm_services = self._load_helm_services()
+        if helm_services.pop(app_key, None) is None:
+            return False
+
+        self._write_service_configs(helm_services)
+        return True
+
+    def _write_service_configs(self, helm_services: Dict):
+        """Sort helm_services and write it plus the public services.json view"""
+        # Sort services according to SERVICE_ORDER, then alphabetically
+        unranked = len(SERVICE_ORDER)
 
-        # Sort services according to SERVICE_ORDER
         def sort_key(item):
             service_name = item[0]
-            try:
-                return SERVICE_ORDER.index(service_name)
-            except ValueError:
-                return len(SERVICE_ORDER) + ord(service_name[0])
+            return SERVICE_RANK.get(service_name, unranked), service_name
 
         sorted_helm_services = dict(sorted(helm_services.items(), key=sort_key))
-        sorted_public_services = dict(sorted(public_services.items(), key=sort_key))
+
+        # Public config includes URL and visibility (for Nexus sidebar)
+        sorted_public_services = {
+            name: {field: config[field] for field in PUBLIC_SERVICE_FIELDS if field in config}
+            for name, config in sorted_helm_services.items()
+        }
 
         # Write helm_services.json - Full config for Helm only
-        with open(self.helm_services_json, 'w') as f:
-            json.dump(sorted_helm_services, f, indent=2)
+        self._write_json_if_changed(self.helm_services_json, sorted_helm_services)
 
         # Write services.json - URLs only, symlinked to other services
-        with open(self.services_json, 'w') as f:
-            json.dump(sorted_public_services, f, indent=2)
+        self._write_json_if_changed(self.services_json, sorted_public_services)
+
+    @staticmethod
+    def _write_json_if_changed(path: Path, data) -> bool:
+        """
+        Write data as indented JSON unless the file already holds exactly that.
+
+        Skipping identical writes keeps the file's mtime, so services that
+        cache the parsed config by mtime don't reload it. Changed files are
+        replaced atomically, so readers never see a partial file.
+        """
+        from config_manager import atomic_write_text
+
+        content = json.dumps(data, indent=2)
+        try:
+            if path.read_text() == content:
+                return False
+        except FileNotFoundError:
+            pass
+
+        atomic_write_text(path, content)
+        return True
 
 
 def main():
@@ -452,8 +835,8 @@ def main():
         print("Commands:")
         print("  check-deps          - Check system dependencies")
         print("  install-dep <name>  - Install a system dependency")
-        print("  clone <app>         - Clone an app")
-        print("  install <app>       - Install an app")
+        print("  clone <app>         - Clone an app (add --full-history for a non-shallow clone)")
+        print("  install <app>...    - Install one or more apps (add --full-history for a non-shallow clone)")
         print("  status <app>        - Get app status")
         print("  pull <app>          - Pull latest changes")
         print("  list-installed      - List installed apps")
@@ -477,15 +860,22 @@ def main():
 
     elif command == 'clone' and len(sys.argv) >= 3:
         app_key = sys.argv[2]
-        success, message = manager.clone_app(app_key)
+        success, message = manager.clone_app(app_key, full_history='--full-history' in sys.argv)
         print(message)
         sys.exit(0 if success else 1)
 
     elif command == 'install' and len(sys.argv) >= 3:
-        app_key = sys.argv[2]
-        success, message = manager.install_app(app_key)
-        print(message)
-        sys.exit(0 if success else 1)
+        app_keys = [arg for arg in sys.argv[2:] if not arg.startswith('--')]
+        full_history = '--full-history' in sys.argv
+        if len(app_keys) == 1:
+            success, message = manager.install_app(app_keys[0], full_history=full_history)
+            print(message)
+            sys.exit(0 if success else 1)
+
+        results = manager.install_apps(app_keys, full_history=full_history)
+        for success, message in results.values():
+            print(message)
+        sys.exit(0 if all(success for success, _ in results.values()) else 1)
 
     elif command == 'status' and len(sys.argv) >= 3:
         app_key = sys.argv[2]
@@ -7,12 +7,17 @@ ingests new log lines into the centralized database.
 """
 
 import os
-import time
 import re
-from datetime import datetime
 from pathlib import Path
+from sqlalchemy import insert
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
+
+if __name__ == '__main__':
+    # Running as the sidecar: importing app must not start a second,
+    # in-process watcher that would ingest every line again
+    os.environ['HELM_LOG_WATCHER'] = 'false'
+
 from models import db, LogEntry
 from app import app
 
@@ -63,35 +68,38 @@ class LogFileHandler(FileSystemEventHandler):
             if not new_lines:
                 return
 
-            # Parse and insert log entries
-            with app.app_context():
-                for line in new_lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    # Parse log level from line if present
-                    level = 'INFO'
-                    if 'ERROR' in line or 'error' in line.lower():
-                        level = 'ERROR'
-                    elif 'WARNING' in line or 'warning' in line.lower():
-                        level = 'WARNING'
-                    elif 'DEBUG' in line or 'debug' in line.lower():
-                        level = 'DEBUG'
-                    elif 'CRITICAL' in line or 'critical' in line.lower():
-                        level = 'CRITICAL'
-
-                    # Create log entry
-                    log_entry = LogEntry(
-                        service_name=service_name,
-                        level=level,
-                        message=line,
-                        timestamp=datetime.utcnow(),
-                        context={'source': log_type}
-                    )
-
-                    db.session.add(log_entry)
+            # Parse log entries, then insert them with one executemany;
+            # timestamps come from the column's server default
+            context = {'source': log_type}
+            rows = []
+            for line in new_lines:
+                line = line.strip()
+                if not line:
+                    continue
+
+                # Parse log level from line if present
+                level = 'INFO'
+                if 'ERROR' in line or 'error' in line.lower():
+                    level = 'ERROR'
+                elif 'WARNING' in line or 'warning' in line.lower():
+                    level = 'WARNING'
+                elif 'DEBUG' in line or 'debug' in line.lower():
+                    level = 'DEBUG'
+                elif 'CRITICAL' in line or 'critical' in line.lower():
+                    level = 'CRITICAL'
+
+                rows.append({
+                    'service_name': service_name,
+                    'level': level,
+                    'message': line,
+                    'context': context
+                })
+
+            if not rows:
+                return
 
+            with app.app_context():
+                db.session.execute(insert(LogEntry.__table__), rows)
                 db.session.commit()
 
         except Exception as e:
@@ -107,20 +115,22 @@ def start_log_watcher():
     observer.schedule(event_handler, str(logs_dir), recursive=False)
 
     # Initialize file positions for existing files
-    for log_file in logs_dir.glob('*.log'):
-        # Start reading from end of existing files
-        event_handler.file_positions[str(log_file)] = log_file.stat().st_size
-
+    with os.scandir(logs_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.log') and not entry.name.startswith('.') and entry.is_file():
+                # Start reading from end of existing files
+                event_handler.file_positions[str(logs_dir / entry.name)] = entry.stat().st_size
+
+    # On Linux watchdog's Observer uses inotify, so the observer thread blocks
+    # on kernel events; just wait on it rather than waking up every second
     observer.start()
     print("Log watcher started, monitoring logs/ directory")
 
     try:
-        while True:
-            time.sleep(1)
+        observer.join()
     except KeyboardInterrupt:
         observer.stop()
-
-    observer.join()
+        observer.join()
 
 if __name__ == '__main__':
     start_log_watcher()
@@ -10,9 +10,11 @@ class LogEntry(db.Model):
     __tablename__ = 'log_entries'
 
     id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
-    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
-    service_name = db.Column(db.String(50), nullable=False, index=True)
-    level = db.Column(db.String(20), nullable=False, index=True)  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+    # Stored as naive UTC; filled in by PostgreSQL when the writer omits it
+    timestamp = db.Column(db.DateTime, nullable=False, index=True,
+                          server_default=db.text("(now() AT TIME ZONE 'utc')"))
+    service_name = db.Column(db.String(50), nullable=False)
+    level = db.Column(db.String(20), nullable=False)  # DEBUG, INFO, WARNING, ERROR, CRITICAL
     message = db.Column(db.Text, nullable=False)
     context = db.Column(JSONB, nullable=True)  # Additional context data (JSON)
     trace_id = db.Column(db.String(36), nullable=True, index=True)  # For request tracing
@@ -22,10 +24,17 @@ class LogEntry(db.Model):
     hostname = db.Column(db.String(255), nullable=True)
     process_id = db.Column(db.Integer, nullable=True)
 
-    # Composite indexes for common query patterns
+    # Composite indexes for common query patterns. The timestamp b-tree above
+    # serves unfiltered time ranges; everything per-service goes through the
+    # one covering index, which also answers per-service level counts with an
+    # index-only scan.
     __table_args__ = (
-        db.Index('idx_log_service_timestamp', 'service_name', 'timestamp'),
+        db.Index('idx_log_service_ts_level', 'service_name', timestamp.desc(), 'level',
+                 postgresql_include=['id']),
         db.Index('idx_log_level_timestamp', 'level', 'timestamp'),
+        # Containment (@>) lookups on structured context fields
+        db.Index('idx_log_context_gin', 'context', postgresql_using='gin',
+                 postgresql_ops={'context': 'jsonb_path_ops'}),
     )
 
     def to_dict(self):
@@ -85,7 +94,7 @@ class ServiceMetric(db.Model):
     __tablename__ = 'service_metrics'
 
     id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
-    service_name = db.Column(db.String(50), nullable=False, index=True)
+    service_name = db.Column(db.String(50), nullable=False)
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     metric_name = db.Column(db.String(100), nullable=False)
     metric_value = db.Column(db.Float, nullable=False)
@@ -94,6 +103,8 @@ class ServiceMetric(db.Model):
     # Composite index for time-series queries
     __table_args__ = (
         db.Index('idx_metric_service_timestamp', 'service_name', 'timestamp'),
+        db.Index('idx_metric_service_name_timestamp', 'service_name', 'metric_name', timestamp.desc()),
+        db.Index('idx_metric_timestamp_brin', 'timestamp', postgresql_using='brin'),
     )
 
     def to_dict(self):
@@ -35,6 +35,8 @@ import tempfile
 import zipfile
 import argparse
 
+from backup import fast_rmtree
+
 SCRIPT_DIR = Path(__file__).parent.absolute()
 
 
@@ -81,7 +83,7 @@ class HiveMatrixRestore:
     def cleanup_temp_dir(self):
         """Remove temporary directory."""
         if self.temp_dir and self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
+            fast_rmtree(self.temp_dir)
             print(f"Cleaned up temp directory")
 
     def restore_configs(self):
@@ -120,7 +122,7 @@ class HiveMatrixRestore:
         if core_keys_src.exists():
             core_keys_dest.parent.mkdir(parents=True, exist_ok=True)
             if core_keys_dest.exists():
-                shutil.rmtree(core_keys_dest)
+                fast_rmtree(core_keys_dest)
             shutil.copytree(core_keys_src, core_keys_dest)
             print(f"  ✓ Restored Core JWT keys")
 
@@ -1,4 +1,4 @@
-from app import app
+from app import app, start_background_workers
 from app.service_manager import ServiceManager
 import requests
 import sys
@@ -134,4 +134,8 @@ if __name__ == '__main__':
     # Security: Bind to localhost only - Helm should not be exposed externally
     # Access via Nexus proxy at https://localhost:443/helm
     debug = get_debug_mode()
+    # With the debug reloader this script also runs in the watching parent;
+    # only the child that serves requests needs the background workers
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_workers()
     app.run(host='127.0.0.1', port=5004, debug=debug)
@@ -7,6 +7,7 @@ Checks for exposed ports and provides security recommendations
 import socket
 import subprocess
 import json
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -39,7 +40,11 @@ class SecurityAuditor:
     def __init__(self, helm_dir: str = None):
         self.helm_dir = Path(helm_dir) if helm_dir else Path(__file__).parent
         self.parent_dir = self.helm_dir.parent
-        self.firewall_status = self.check_firewall_status()
+
+    @cached_property
+    def firewall_status(self) -> Dict:
+        """Firewall status, checked on first use (script generation never needs it)"""
+        return self.check_firewall_status()
 
     def check_firewall_status(self) -> Dict:
         """
@@ -122,44 +127,59 @@ class SecurityAuditor:
         """Check if a specific port is protected by firewall"""
         return self.firewall_status['active'] and port in self.firewall_status['protected_ports']
 
-    def check_port_binding(self, port: int) -> Tuple[bool, str]:
+    def get_port_bindings(self) -> Dict[int, Tuple[bool, str]]:
         """
-        Check if a port is bound to localhost or all interfaces
-        Returns: (is_localhost_only, binding_address)
+        Map every listening TCP port to its binding with a single `ss` call
+        Returns: {port: (is_localhost_only, binding_address)}, or None if ss failed
         """
         try:
-            # Use ss command to check port bindings
             result = subprocess.run(
                 ['ss', '-tlnp'],
                 capture_output=True,
                 text=True,
                 check=True
             )
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return None
+
+        bindings = {}
+        for line in result.stdout.split('\n'):
+            # Parse the line to get the binding address
+            parts = line.split()
+            if len(parts) < 4 or ':' not in parts[3]:
+                continue
+            ip, port_str = parts[3].rsplit(':', 1)
+            try:
+                port = int(port_str)
+            except ValueError:
+                continue  # Header line
+
+            # Handle IPv6 addresses
+            if ip == '[::]' or ip == '*':
+                binding = (False, '0.0.0.0')
+            elif ip == '127.0.0.1' or ip == '[::1]':
+                binding = (True, '127.0.0.1')
+            elif ip == '0.0.0.0':
+                binding = (False, '0.0.0.0')
+            else:
+                binding = (False, ip)
+            bindings.setdefault(port, binding)
 
-            for line in result.stdout.split('\n'):
-                if f':{port}' in line:
-                    # Parse the line to get the binding address
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        local_addr = parts[3]
-                        # Extract just the IP part
-                        if ':' in local_addr:
-                            ip = local_addr.rsplit(':', 1)[0]
-                            # Handle IPv6 addresses
-                            if ip == '[::]' or ip == '*':
-                                return False, '0.0.0.0'
-                            elif ip == '127.0.0.1' or ip == '[::1]':
-                                return True, '127.0.0.1'
-                            elif ip == '0.0.0.0':
-                                return False, '0.0.0.0'
-                            else:
-                                return False, ip
-
-            # Port not found - not listening
-            return None, 'not listening'
+        return bindings
 
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return None, 'unknown'
+    def check_port_binding(self, port: int, bindings: Dict = None) -> Tuple[bool, str]:
+        """
+        Check if a port is bound to localhost or all interfaces
+        Pass the result of get_port_bindings() to avoid re-running ss per port.
+        Returns: (is_localhost_only, binding_address)
+        """
+        if bindings is None:
+            bindings = self.get_port_bindings()
+            if bindings is None:
+                return None, 'unknown'
+
+        # Port not found - not listening
+        return bindings.get(port, (None, 'not listening'))
 
     def audit_services(self) -> Dict:
         """
@@ -177,9 +197,19 @@ class SecurityAuditor:
             'severity': 'none'  # none, low, medium, high, critical
         }
 
+        # One socket table snapshot for every service check; if ss is
+        # unavailable every port's binding is 'unknown' rather than re-running
+        # ss for each one
+        bindings = self.get_port_bindings()
+
+        def check_port_binding(port):
+            if bindings is None:
+                return None, 'unknown'
+            return self.check_port_binding(port, bindings)
+
         # Check localhost-only services
         for service_name, port in self.LOCALHOST_ONLY_SERVICES.items():
-            is_localhost, binding = self.check_port_binding(port)
+            is_localhost, binding = check_port_binding(port)
 
             if is_localhost is None:
                 findings['not_running'].append({
@@ -206,7 +236,7 @@ class SecurityAuditor:
 
         # Check firewall-protected services (can be exposed if firewalled)
         for service_name, port in self.FIREWALL_PROTECTED_SERVICES.items():
-            is_localhost, binding = self.check_port_binding(port)
+            is_localhost, binding = check_port_binding(port)
 
             if is_localhost is None:
                 findings['not_running'].append({
@@ -244,7 +274,7 @@ class SecurityAuditor:
 
         # Check public services
         for service_name, port in self.PUBLIC_SERVICES.items():
-            is_localhost, binding = self.check_port_binding(port)
+            is_localhost, binding = check_port_binding(port)
 
             if is_localhost is None:
                 findings['not_running'].append({